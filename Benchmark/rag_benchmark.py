@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+
+import yaml
+
+# the stub LLM answers without delay, the chain latency is the pipeline overhead
+os.environ.setdefault('PILOT_STUB_LATENCY', '0')
+
+# the benchmark uses the ingestion and client apps modules
+BENCHMARK_PATH = os.path.dirname(os.path.abspath(__file__))
+for folder in ['ClientApp', 'Transform_Data', 'Common']:
+    sys.path.append(os.path.join(BENCHMARK_PATH, '..', folder))
+
+import chromadb  # noqa: E402
+from langchain_huggingface import HuggingFaceEmbeddings  # noqa: E402
+
+from bm25_index import BM25Index  # noqa: E402
+from context_packer import CONTEXT_TOKEN_BUDGET, count_tokens  # noqa: E402
+from embeddings_to_chroma import (DB_COLLECTION, DB_PORT, DB_SERVER, MODEL_NAME, create_doc_embeddings,  # noqa: E402
+                                  load_file)
+from issues_pilot_core import HYBRID_K, VECTOR_K, IssuesPilot, query_prompt_text  # noqa: E402
+from latency_stats import latency_stats  # noqa: E402
+
+# fixed dataset, labeled queries, and results folder
+BENCHMARK_DATASET = os.path.join(BENCHMARK_PATH, 'dataset')
+BENCHMARK_QUERIES = os.path.join(BENCHMARK_PATH, 'queries.yml')
+BENCHMARK_RESULTS = os.path.join(BENCHMARK_PATH, 'results')
+
+# the benchmark collection and BM25 index, separate from the operators collection
+BENCHMARK_COLLECTION = DB_COLLECTION + '-benchmark'
+BENCHMARK_INDEX = os.path.join(BENCHMARK_PATH, 'bm25_index_benchmark.json')
+
+
+def git_revision():
+    """
+    The function will identify the code revision benchmarked, to compare the runs over time
+    :return: short commit hash, or None
+    """
+    process = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                             cwd=BENCHMARK_PATH)
+    return process.stdout.strip() if process.returncode == 0 else None
+
+
+def build_collection(dataset, chroma_db_server):
+    """
+    The function will build the benchmark collection and BM25 index from the dataset files,
+    with the embeddings app functions, and measure the ingest throughput
+    :param dataset: folder with the fixture files
+    :param chroma_db_server: Chroma client
+    :return: ingest statistics
+    """
+
+    # start from an empty collection and index
+    if BENCHMARK_COLLECTION in [collection.name for collection in chroma_db_server.list_collections()]:
+        chroma_db_server.delete_collection(name=BENCHMARK_COLLECTION)
+    if os.path.exists(BENCHMARK_INDEX):
+        os.remove(BENCHMARK_INDEX)
+    index = BM25Index(BENCHMARK_INDEX)
+
+    start_time = time.perf_counter()
+    embeddings = HuggingFaceEmbeddings(model_name=MODEL_NAME)
+    model_seconds = time.perf_counter() - start_time
+
+    files_list = sorted(file for file in os.listdir(dataset) if not file.startswith('.'))
+    start_time = time.perf_counter()
+    collection_count = 0
+    for file in files_list:
+        file_content = load_file(file, dataset)
+        collection_count = create_doc_embeddings(document=file_content, file=file.split(".")[0], index=index,
+                                                 embeddings=embeddings, chroma_db_server=chroma_db_server,
+                                                 collection_name=BENCHMARK_COLLECTION)
+    index.save()
+    ingest_seconds = time.perf_counter() - start_time
+
+    return {'files': len(files_list), 'chunks': collection_count,
+            'model load seconds': round(model_seconds, 3), 'ingest seconds': round(ingest_seconds, 3),
+            'files per second': round(len(files_list) / ingest_seconds, 2),
+            'chunks per second': round(collection_count / ingest_seconds, 2)}
+
+
+def is_relevant(doc, spec):
+    """
+    The function will check if the retrieved chunk matches the relevance label
+    :param doc: retrieved document
+    :param spec: label, metadata values and optional 'contains' text
+    :return: True or False
+    """
+    for key, value in spec.items():
+        if key == 'contains':
+            if value not in doc.page_content:
+                return False
+        elif doc.metadata.get(key) != value:
+            return False
+    return True
+
+
+def score_results(docs, relevant, k):
+    """
+    The function will calculate the recall@k and reciprocal rank of the retrieved documents
+    :param docs: retrieved documents, best match first
+    :param relevant: relevance labels
+    :param k: number of results evaluated
+    :return: recall@k, reciprocal rank
+    """
+    docs = docs[:k]
+    found = [spec for spec in relevant if any(is_relevant(doc, spec) for doc in docs)]
+    reciprocal_rank = 0.0
+    for rank, doc in enumerate(docs, start=1):
+        if any(is_relevant(doc, spec) for spec in relevant):
+            reciprocal_rank = 1.0 / rank
+            break
+    return len(found) / len(relevant), reciprocal_rank
+
+
+def evaluate_retriever(pilot, retriever, queries, k, runs):
+    """
+    The function will run the labeled queries through the retriever. The cold pass runs with
+    empty query embeddings and retrieval caches, the warm passes reuse the caches.
+    :param pilot: IssuesPilot
+    :param retriever: retriever to be evaluated
+    :param queries: labeled queries
+    :param k: number of results evaluated
+    :param runs: number of warm passes
+    :return: retrieval quality and latency statistics
+    """
+    pilot.embeddings.cache.clear()
+    pilot.vector_retriever.cache.clear()
+
+    recalls = []
+    reciprocal_ranks = []
+    per_query = []
+    cold_seconds = []
+    for item in queries:
+        start_time = time.perf_counter()
+        docs = retriever.invoke(item['query'])
+        cold_seconds.append(time.perf_counter() - start_time)
+        recall, reciprocal_rank = score_results(docs, item['relevant'], k)
+        recalls.append(recall)
+        reciprocal_ranks.append(reciprocal_rank)
+        per_query.append({'query': item['query'], 'recall': recall, 'reciprocal rank': reciprocal_rank})
+
+    warm_seconds = []
+    for run in range(runs):
+        for item in queries:
+            start_time = time.perf_counter()
+            retriever.invoke(item['query'])
+            warm_seconds.append(time.perf_counter() - start_time)
+
+    return {'recall@' + str(k): round(sum(recalls) / len(recalls), 4),
+            'MRR': round(sum(reciprocal_ranks) / len(reciprocal_ranks), 4),
+            'cold latency': latency_stats(cold_seconds), 'warm latency': latency_stats(warm_seconds),
+            'queries': per_query}
+
+
+def evaluate_chain(pilot, queries):
+    """
+    The function will run the labeled queries through the query chain, with the stub LLM, and
+    count the prompt tokens sent to the LLM
+    :param pilot: IssuesPilot, stub backend
+    :param queries: labeled queries
+    :return: prompt tokens and chain latency statistics
+    """
+    prompt_tokens = []
+    context_tokens = []
+    chain_seconds = []
+    for item in queries:
+        start_time = time.perf_counter()
+        response = pilot.query_chain.invoke({"input": item['query']})
+        chain_seconds.append(time.perf_counter() - start_time)
+
+        # the stuff documents chain joins the documents with a blank line
+        context = '\n\n'.join(doc.page_content for doc in response['context'])
+        context_tokens.append(count_tokens(context))
+        prompt_tokens.append(count_tokens(query_prompt_text + "\n\nRetrieved Context:\n" + context) +
+                             count_tokens(item['query']))
+
+    return {'prompt tokens mean': round(sum(prompt_tokens) / len(prompt_tokens), 1),
+            'prompt tokens max': max(prompt_tokens),
+            'context tokens mean': round(sum(context_tokens) / len(context_tokens), 1),
+            'context token budget': CONTEXT_TOKEN_BUDGET,
+            'chain latency': latency_stats(chain_seconds)}
+
+
+def main():
+    """
+    This app will benchmark the retrieval augmented generation pipeline, offline.
+    The collection is built from the fixed dataset with the embeddings app, the labeled queries
+    are run through the client apps retrievers and query chain, with the stub LLM.
+    The retrieval recall@k and MRR, latency percentiles, prompt token counts and ingest
+    throughput are saved to a JSON file, to compare the runs over time.
+    """
+
+    # parse the input arguments
+    parser = argparse.ArgumentParser(description="IssuesPilot offline RAG evaluation and latency benchmark")
+    parser.add_argument("--dataset", default=BENCHMARK_DATASET, help="Folder with the fixture files")
+    parser.add_argument("--queries", default=BENCHMARK_QUERIES, help="Labeled queries YAML file")
+    parser.add_argument("--k", type=int, default=HYBRID_K, help="Number of retrieved chunks evaluated")
+    parser.add_argument("--runs", type=int, default=5, help="Number of warm retrieval passes")
+    parser.add_argument("--output", help="Results JSON file, default Benchmark/results/<timestamp>.json")
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark collection and BM25 index")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with open(args.queries, 'r') as file:
+        queries = yaml.safe_load(file)
+
+    chroma_db_server = chromadb.HttpClient(host=DB_SERVER, port=DB_PORT)
+    chroma_db_server.heartbeat()
+
+    # build the collection through the embeddings app path
+    ingest = build_collection(args.dataset, chroma_db_server)
+    print('Ingest: ' + str(ingest['files']) + ' files, ' + str(ingest['chunks']) + ' chunks, ' +
+          str(ingest['chunks per second']) + ' chunks/s')
+
+    # the client apps retrievers and chains, with the deterministic stub LLM
+    pilot = IssuesPilot(backend='stub', mode='query', background=False, collection_name=BENCHMARK_COLLECTION,
+                        index_path=BENCHMARK_INDEX)
+
+    retrieval = {}
+    for name, retriever in [('vector', pilot.vector_retriever), ('hybrid', pilot.retriever)]:
+        retrieval[name] = evaluate_retriever(pilot, retriever, queries, args.k, args.runs)
+        print(name.capitalize() + ' retriever: recall@' + str(args.k) + ' ' +
+              str(retrieval[name]['recall@' + str(args.k)]) + ', MRR ' + str(retrieval[name]['MRR']) +
+              ', cold p95 ' + str(retrieval[name]['cold latency']['p95 ms']) + ' ms, warm p95 ' +
+              str(retrieval[name]['warm latency']['p95 ms']) + ' ms')
+
+    chain = evaluate_chain(pilot, queries)
+    print('Query chain: prompt tokens mean ' + str(chain['prompt tokens mean']) + ', max ' +
+          str(chain['prompt tokens max']) + ', p95 latency ' + str(chain['chain latency']['p95 ms']) + ' ms')
+
+    results = {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'config': {'embeddings model': MODEL_NAME, 'vector k': VECTOR_K['stub'], 'hybrid k': HYBRID_K,
+                   'evaluated k': args.k, 'warm runs': args.runs, 'queries': len(queries),
+                   'dataset': os.path.abspath(args.dataset)},
+        'ingest': ingest,
+        'retrieval': retrieval,
+        'chain': chain,
+    }
+
+    output = args.output
+    if output is None:
+        os.makedirs(BENCHMARK_RESULTS, exist_ok=True)
+        output = os.path.join(BENCHMARK_RESULTS, datetime.datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    with open(output, 'w') as file:
+        json.dump(results, file, indent=4)
+    print('Results saved to: ' + output)
+
+    # remove the benchmark collection and index
+    if not args.keep:
+        chroma_db_server.delete_collection(name=BENCHMARK_COLLECTION)
+        os.remove(BENCHMARK_INDEX)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+
+CACHE_CONTROL = {'type': 'ephemeral'}
+
+
+def text_block(text, cacheable=False):
+    """
+    The function will create an Anthropic text content block
+    :param text: block text
+    :param cacheable: mark the block as the end of a cacheable prefix
+    :return: content block dict
+    """
+    block = {'type': 'text', 'text': text}
+    if cacheable:
+        block['cache_control'] = CACHE_CONTROL
+    return block
+
+
+def message_text(message):
+    """
+    The function will return the text of a message, or streamed message chunk, with the content
+    as a string or as content blocks
+    :param message: message or message chunk
+    :return: text
+    """
+    if isinstance(message.content, str):
+        return message.content
+    return ''.join(block.get('text', '') for block in message.content if isinstance(block, dict))
+
+
+class CachedPromptBuilder:
+    """
+    Anthropic messages builder, with the stable prefix marked cacheable. The layout is:
+    - system: instructions (cache breakpoint), retrieved context (cache breakpoint)
+    - chat history, the last history message is a cache breakpoint
+    - human: the user input, not cached
+    The retrieved context of the previous turn is reused when the new retrieval returns no new
+    chunks, the prefix stays identical and is read from the cache.
+    """
+
+    def __init__(self, system_prompt):
+        self.system_prompt = system_prompt
+        self.context = None
+        self.context_chunks = set()
+
+    def select_context(self, docs):
+        """
+        The function will return the context text for the turn, the previous context is reused
+        when it already includes all the retrieved chunks
+        :param docs: retrieved documents
+        :return: context text
+        """
+        chunks = set(doc.page_content for doc in docs)
+        if self.context is None or not chunks <= self.context_chunks:
+            self.context = '\n\n'.join(doc.page_content for doc in docs)
+            self.context_chunks = chunks
+        return self.context
+
+    def build_messages(self, docs, chat_history, query):
+        """
+        The function will create the messages for the turn
+        :param docs: retrieved documents
+        :param chat_history: chat history messages
+        :param query: user input
+        :return: messages list
+        """
+        context = self.select_context(docs)
+        messages = [SystemMessage(content=[
+            text_block(self.system_prompt, cacheable=True),
+            text_block('Retrieved Context:\n' + context, cacheable=True),
+        ])]
+        history = list(chat_history)
+        if history:
+            last = history[-1]
+            message_type = AIMessage if isinstance(last, AIMessage) else HumanMessage
+            history[-1] = message_type(content=[text_block(message_text(last), cacheable=True)])
+        messages.extend(history)
+        messages.append(HumanMessage(content=query))
+        return messages
+
+
+def cache_usage(usage_metadata):
+    """
+    The function will split the input tokens in cache read, cache write and uncached tokens
+    :param usage_metadata: response usage metadata
+    :return: dict with the input tokens
+    """
+    usage_metadata = usage_metadata or {}
+    details = usage_metadata.get('input_token_details') or {}
+    cache_read = details.get('cache_read') or 0
+    cache_creation = details.get('cache_creation') or 0
+    return {'cache read': cache_read,
+            'cache write': cache_creation,
+            'uncached': usage_metadata.get('input_tokens', 0) - cache_read - cache_creation}
+
+
+def usage_report(usage_metadata):
+    """
+    The function will create the input tokens report for the turn
+    :param usage_metadata: response usage metadata
+    :return: report string
+    """
+    usage = cache_usage(usage_metadata)
+    return ('[input tokens: ' + str(usage['cache read']) + ' cached, ' + str(usage['cache write']) +
+            ' cache write, ' + str(usage['uncached']) + ' uncached]')
+
+
+def stream_tokens(llm, messages, response):
+    """
+    The function will stream the answer text, the aggregated response message is saved to
+    {response}, for the usage metadata
+    :param llm: chat model
+    :param messages: prompt messages
+    :param response: dict, the 'message' key is set with the aggregated response
+    :return: text tokens iterator
+    """
+    message = None
+    for chunk in llm.stream(messages):
+        message = chunk if message is None else message + chunk
+        yield message_text(chunk)
+    response['message'] = message
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+from langchain_core.documents import Document
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+
+from anthropic_prompt_cache import CACHE_CONTROL, CachedPromptBuilder, cache_usage, message_text
+
+
+class StubAnthropic:
+    """
+    Local stub for the Anthropic chat model. It records the messages and reports the prompt
+    cache usage, the prefix up to the last cache breakpoint is read from the cache when it is
+    identical to the previous request prefix.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.cached_prefix = None
+
+    def invoke(self, messages):
+        self.requests.append(messages)
+        prefix = []
+        for message in messages[:-1]:
+            prefix.append(repr(message.content))
+        input_tokens = sum(len(message_text(message)) // 4 for message in messages)
+        query_tokens = len(message_text(messages[-1])) // 4
+        cached = self.cached_prefix is not None and prefix[:len(self.cached_prefix)] == self.cached_prefix
+        prefix_tokens = input_tokens - query_tokens
+        self.cached_prefix = prefix
+        details = {'cache_read': prefix_tokens if cached else 0,
+                   'cache_creation': 0 if cached else prefix_tokens}
+        return AIMessage(content='Stub answer for: ' + message_text(messages[-1]),
+                         usage_metadata={'input_tokens': input_tokens, 'output_tokens': 5,
+                                         'total_tokens': input_tokens + 5, 'input_token_details': details})
+
+
+def check_layout(messages, history_length):
+    """
+    The function will verify the messages layout
+    :param messages: messages sent to the LLM
+    :param history_length: number of chat history messages
+    :return: None
+    """
+    system = messages[0]
+    assert isinstance(system, SystemMessage), 'the first message is the system prompt'
+    assert len(system.content) == 2, 'the system message has the instructions and context blocks'
+    assert system.content[0]['cache_control'] == CACHE_CONTROL, 'the instructions are cacheable'
+    assert system.content[1]['text'].startswith('Retrieved Context:'), 'the second block is the context'
+    assert system.content[1]['cache_control'] == CACHE_CONTROL, 'the context is cacheable'
+    assert len(messages) == history_length + 2, 'system, chat history and user input'
+    if history_length:
+        assert messages[-2].content[0]['cache_control'] == CACHE_CONTROL, 'the last history message is cacheable'
+    for message in messages[1:-2]:
+        assert isinstance(message.content, str), 'only the last history message is a cache breakpoint'
+    assert isinstance(messages[-1], HumanMessage) and isinstance(messages[-1].content, str), \
+        'the user input is not cached'
+
+
+def main():
+    """
+    This app will verify the Anthropic prompt cache messages layout, with a local stub, without
+    calling the Anthropic API. Two turns retrieve the same chunks, the second turn reuses the
+    context and reads the prefix from the cache.
+    """
+
+    llm = StubAnthropic()
+    prompt_builder = CachedPromptBuilder('You are an assistant for network troubleshooting tasks.')
+    docs = [Document(page_content='PDX-RN ACL WAN 10 deny tcp any eq bgp any', metadata={'source': 'a'}),
+            Document(page_content='PDX-RO BGP neighbor 10.93.141.42 Idle', metadata={'source': 'b'})]
+    chat_history = []
+
+    for turn, query in enumerate(['Why is BGP down on PDX-RO?', 'How do I fix that?']):
+        retrieved = docs if turn == 0 else docs[:1]
+        messages = prompt_builder.build_messages(retrieved, chat_history, query)
+        check_layout(messages, len(chat_history))
+        response = llm.invoke(messages)
+        usage = cache_usage(response.usage_metadata)
+        print('Turn ' + str(turn + 1) + ' input tokens: ' + str(usage))
+        chat_history.extend([HumanMessage(content=query), AIMessage(content=message_text(response))])
+
+    first, second = llm.requests
+    assert first[0].content == second[0].content, 'the context is reused, the system prefix is identical'
+    assert usage['cache read'] > 0, 'the second turn reads the prefix from the cache'
+    print('Anthropic prompt cache layout verified')
+
+
+if __name__ == "__main__":
+    main()
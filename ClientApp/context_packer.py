@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import logging
+import os
+
+from langchain_core.documents import Document
+
+# maximum number of retrieved context tokens sent to the LLM
+CONTEXT_TOKEN_BUDGET = int(os.getenv('CONTEXT_TOKEN_BUDGET', '1500'))
+
+# the embeddings app splits with a 25 characters overlap, the search allows a margin
+MAX_OVERLAP = 100
+MIN_OVERLAP = 3
+
+_encoding = None
+
+
+def count_tokens(text):
+    """
+    The function will count the text tokens with the tiktoken encoding, installed with
+    langchain-openai, or estimate them as 4 characters per token. The encoding file is downloaded
+    on first use, if tiktoken is missing or the download fails the estimate is used for the process.
+    :param text: text
+    :return: number of tokens
+    """
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding('cl100k_base')
+        except Exception as error:
+            logging.info(' tiktoken encoding not available, tokens estimated as 4 characters per token: ' +
+                         str(error))
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def merge_text(first, second):
+    """
+    The function will merge two contiguous chunks, removing the overlap text
+    :param first: chunk content
+    :param second: next chunk content
+    :return: merged content
+    """
+    for length in range(min(len(first), len(second), MAX_OVERLAP), MIN_OVERLAP - 1, -1):
+        if first.endswith(second[:length]):
+            return first + second[length:]
+    return first + '\n' + second
+
+
+class ContextPacker:
+    """
+    Context assembly for the question answer chains. The retrieved chunks are grouped by source
+    file, the contiguous chunks are merged without the overlap, and the merged blocks are packed
+    in relevance order within the token budget. The packer keeps no state, it is shared by the
+    concurrent requests of the HTTP service.
+    """
+
+    def __init__(self, token_budget=CONTEXT_TOKEN_BUDGET):
+        self.token_budget = token_budget
+
+    def merge_chunks(self, docs):
+        """
+        The function will merge the contiguous chunks from the same source file
+        :param docs: retrieved documents, best match first
+        :return: list of (relevance rank, document), one document for each merged block
+        """
+        groups = {}
+        for rank, doc in enumerate(docs):
+            source = doc.metadata.get('source', str(rank))
+            groups.setdefault(source, []).append((doc.metadata.get('chunk_number'), rank, doc))
+
+        blocks = []
+        for source, chunks in groups.items():
+            chunks.sort(key=lambda chunk: (chunk[0] is None, chunk[0] or 0))
+            block = None
+            for chunk_number, rank, doc in chunks:
+                if (block is not None and chunk_number is not None and block['last'] is not None
+                        and chunk_number <= block['last'] + 1):
+                    if chunk_number == block['last'] + 1:
+                        block['text'] = merge_text(block['text'], doc.page_content)
+                        block['last'] = chunk_number
+                    block['rank'] = min(block['rank'], rank)
+                    continue
+                if block is not None:
+                    blocks.append(block)
+                block = {'text': doc.page_content, 'first': chunk_number, 'last': chunk_number,
+                         'rank': rank, 'metadata': dict(doc.metadata)}
+            blocks.append(block)
+
+        merged = []
+        for block in blocks:
+            metadata = block['metadata']
+            if block['first'] != block['last']:
+                metadata['chunk_numbers'] = str(block['first']) + '-' + str(block['last'])
+            merged.append((block['rank'], Document(page_content=block['text'], metadata=metadata)))
+        return merged
+
+    def pack(self, docs, stats=None):
+        """
+        The function will assemble the context, within the token budget. The blocks that do not
+        fit are skipped, the most relevant block is always included.
+        :param docs: retrieved documents, best match first
+        :param stats: optional, dict updated with the packing statistics of this request
+        :return: packed documents
+        """
+        tokens_in = sum(count_tokens(doc.page_content) for doc in docs)
+        packed = []
+        seen = set()
+        tokens_out = 0
+        for rank, doc in sorted(self.merge_chunks(docs), key=lambda block: block[0]):
+            if doc.page_content in seen:
+                continue
+            tokens = count_tokens(doc.page_content)
+            if packed and tokens_out + tokens > self.token_budget:
+                continue
+            seen.add(doc.page_content)
+            packed.append(doc)
+            tokens_out += tokens
+        if stats is not None:
+            stats.update({'chunks in': len(docs), 'blocks out': len(packed), 'tokens in': tokens_in,
+                          'tokens out': tokens_out, 'tokens saved': tokens_in - tokens_out})
+        return packed
+
+    @staticmethod
+    def report(stats):
+        """
+        The function will create the context packing report for the turn
+        :param stats: packing statistics, from the pack function
+        :return: report string
+        """
+        return ('[context: ' + str(stats.get('chunks in', 0)) + ' chunks packed in ' +
+                str(stats.get('blocks out', 0)) + ' blocks, ' + str(stats.get('tokens out', 0)) +
+                ' tokens, ' + str(stats.get('tokens saved', 0)) + ' tokens saved]')
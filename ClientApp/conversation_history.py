@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import json
+import logging
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+
+from context_packer import count_tokens
+
+# maximum number of chat history tokens sent to the LLM, summary included
+HISTORY_TOKEN_BUDGET = int(os.getenv('HISTORY_TOKEN_BUDGET', '2000'))
+
+# folder for the saved conversations
+SESSIONS_PATH = os.getenv('SESSIONS_PATH', 'sessions')
+
+summary_prompt = (
+    "You maintain the running summary of a network troubleshooting conversation. "
+    "Update the summary with the new conversation turns. Keep the devices, issues, "
+    "IP addresses, commands, findings and recommended actions. Be concise."
+)
+
+# the background summarization is shared by all the conversations
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='history-summary')
+
+
+class ConversationHistory:
+    """
+    Token-aware chat history. The recent turns are kept within the token budget, the older turns
+    are compressed in a running summary by a background LLM call, off the critical path.
+    """
+
+    def __init__(self, llm, token_budget=HISTORY_TOKEN_BUDGET, session_id=None):
+        self.llm = llm
+        self.token_budget = token_budget
+        self.session_id = session_id
+        self.summary = ''
+        self.messages = []
+        self.future = None
+        self.summarized_count = 0
+
+    def tokens(self):
+        """
+        The function will count the chat history tokens, summary included
+        :return: number of tokens
+        """
+        return count_tokens(self.summary) + sum(count_tokens(message.content) for message in self.messages)
+
+    def summarize(self, summary, messages):
+        """
+        The function will update the running summary with the messages, it runs in the background
+        :param summary: current summary
+        :param messages: messages to be added to the summary
+        :return: updated summary
+        """
+        transcript = 'Current summary:\n' + (summary or 'none') + '\n\nNew conversation turns:\n'
+        for message in messages:
+            role = 'User' if isinstance(message, HumanMessage) else 'IssuesPilot'
+            transcript += role + ': ' + message.content + '\n'
+        response = self.llm.invoke([SystemMessage(content=summary_prompt), HumanMessage(content=transcript)])
+        return response.content if isinstance(response.content, str) else str(response.content)
+
+    def collect(self):
+        """
+        The function will apply the background summary, if completed. The summarized turns are
+        kept in the history until the summary is available.
+        :return: None
+        """
+        if self.future is None or not self.future.done():
+            return
+        try:
+            self.summary = self.future.result()
+            self.messages = self.messages[self.summarized_count:]
+        except Exception as error:
+            logging.warning(' Chat history summary failed, the turns are kept: ' + str(error))
+        self.future = None
+        self.summarized_count = 0
+
+    def add_turn(self, query, answer):
+        """
+        The function will add the conversation turn. If the history is over the token budget, the
+        oldest turns are summarized in the background, the most recent turn is always kept.
+        :param query: user input
+        :param answer: IssuesPilot answer
+        :return: None
+        """
+        self.messages.extend([HumanMessage(content=query), AIMessage(content=answer)])
+        self.collect()
+        if self.future is not None or self.tokens() <= self.token_budget:
+            return
+        # select the oldest turns, until the recent turns fit in the budget
+        tokens = self.tokens()
+        count = 0
+        while count < len(self.messages) - 2 and tokens > self.token_budget:
+            tokens -= count_tokens(self.messages[count].content) + count_tokens(self.messages[count + 1].content)
+            count += 2
+        if count:
+            self.summarized_count = count
+            self.future = _executor.submit(self.summarize, self.summary, self.messages[:count])
+
+    def get_messages(self):
+        """
+        The function will return the chat history for the prompt, the summary first
+        :return: messages list
+        """
+        self.collect()
+        if not self.summary:
+            return list(self.messages)
+        return [HumanMessage(content='Summary of the earlier conversation:\n' + self.summary)] + self.messages
+
+    def session_file(self):
+        return os.path.join(SESSIONS_PATH, self.session_id + '.json')
+
+    def save(self):
+        """
+        The function will save the conversation to the {SESSIONS_PATH} folder, the summary and
+        the recent turns, a resumed conversation does not replay the older turns. The turns being
+        summarized in the background are saved as turns, it does not wait for the summary.
+        :return: None
+        """
+        if not self.session_id:
+            return
+        if not os.path.exists(SESSIONS_PATH):
+            os.makedirs(SESSIONS_PATH)
+        data = {'session_id': self.session_id,
+                'summary': self.summary,
+                'messages': [{'role': 'human' if isinstance(message, HumanMessage) else 'ai',
+                              'content': message.content} for message in self.messages]}
+        temp_file = self.session_file() + '.tmp'
+        with open(temp_file, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp_file, self.session_file())
+
+    def load(self):
+        """
+        The function will load the saved conversation, if any
+        :return: True if the conversation was resumed
+        """
+        if not self.session_id or not os.path.exists(self.session_file()):
+            return False
+        with open(self.session_file(), 'r') as f:
+            data = json.load(f)
+        self.summary = data['summary']
+        self.messages = [HumanMessage(content=message['content']) if message['role'] == 'human'
+                         else AIMessage(content=message['content']) for message in data['messages']]
+        return True
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import logging
+import os
+import sys
+
+from typing import Any, List
+
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+# the BM25 index and pipeline tracing modules are shared with the embeddings app
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common'))
+
+from bm25_index import BM25Index, identifier_tokens, tokenize  # noqa: E402
+from pipeline_tracing import record_first_retrieval  # noqa: E402
+
+# reciprocal rank fusion constant, ranks below ~60 contribute little to the fused score
+RRF_K = 60
+
+
+def document_key(doc):
+    """
+    The function will identify the chunk, by Chroma id, or by source and chunk number
+    :param doc: retrieved document
+    :return: chunk key
+    """
+    if getattr(doc, 'id', None):
+        return doc.id
+    return str(doc.metadata.get('source')) + '#' + str(doc.metadata.get('chunk_number'))
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    Retriever that fuses the BM25 lexical matches and the vector similarity matches, with
+    reciprocal rank fusion. The queries with exact identifiers only (IP addresses, hostnames,
+    AS numbers) are answered from the inverted index, without a vector search.
+    """
+
+    vector_retriever: Any
+    index: Any = None
+    k: int = 6
+    lexical_k: int = 10
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if self.index is None:
+            self.index = BM25Index().load()
+        if not os.path.exists(self.index.path):
+            logging.warning(' BM25 index not found: ' + self.index.path + ', the retrieval is vector only until the '
+                            'embeddings app creates it, check the APPS_PATH or BM25_INDEX environment variables')
+
+    def lexical_documents(self, query, required_terms=None):
+        """
+        The function will return the BM25 matches as documents
+        :param query: query text
+        :param required_terms: optional, only the chunks with all these terms are returned
+        :return: documents list, best match first
+        """
+        docs = []
+        for chunk_id, score, doc in self.index.search(query, k=self.lexical_k, required_terms=required_terms):
+            docs.append(Document(id=chunk_id, page_content=doc['text'], metadata=doc['metadata']))
+        return docs
+
+    def _get_relevant_documents(self, query: str, *, run_manager=None) -> List[Document]:
+        self.index.reload_if_changed()
+
+        # exact-match lookup, the query is only identifiers, e.g. "10.93.141.42" or "PDX-RN 65001"
+        identifiers = identifier_tokens(query)
+        if identifiers and len(identifiers) == len(tokenize(query)):
+            docs = self.lexical_documents(query, required_terms=identifiers)
+            if docs:
+                record_first_retrieval(docs[:self.k])
+                return docs[:self.k]
+
+        lexical_docs = self.lexical_documents(query)
+        vector_docs = self.vector_retriever.invoke(query)
+
+        scores = {}
+        docs = {}
+        for ranked_docs in [lexical_docs, vector_docs]:
+            for rank, doc in enumerate(ranked_docs):
+                key = document_key(doc)
+                scores[key] = scores.get(key, 0.0) + 1.0 / (RRF_K + rank + 1)
+                docs.setdefault(key, doc)
+        ranked_keys = sorted(scores, key=scores.get, reverse=True)
+        ranked_docs = [docs[key] for key in ranked_keys[:self.k]]
+
+        # the first retrieval of each collected issue completes its pipeline trace
+        record_first_retrieval(ranked_docs)
+        return ranked_docs
@@ -0,0 +1,291 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+
+from array import array
+from collections import OrderedDict
+from typing import Any, List
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+
+# number of query embeddings and retrieval results kept in the cache
+CACHE_SIZE = int(os.getenv('CACHE_SIZE', '256'))
+
+# seconds between two checks of the collection count, for cache invalidation
+CACHE_CHECK_INTERVAL = float(os.getenv('CACHE_CHECK_INTERVAL', '5'))
+
+# semantic answer cache size, time to live in seconds, and query similarity threshold
+ANSWER_CACHE_SIZE = int(os.getenv('ANSWER_CACHE_SIZE', '128'))
+ANSWER_CACHE_TTL = float(os.getenv('ANSWER_CACHE_TTL', '300'))
+ANSWER_CACHE_THRESHOLD = float(os.getenv('ANSWER_CACHE_THRESHOLD', '0.95'))
+
+
+class LRUCache:
+    """
+    Thread safe least recently used cache, with hit rate and latency saved statistics
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.miss_seconds = 0.0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        The function will return the cached value and mark it as recently used
+        :param key: cache key
+        :return: found flag, cached value
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return True, self._data[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value, seconds=0.0):
+        """
+        The function will save the value to the cache, evicting the least recently used entry
+        :param key: cache key
+        :param value: value to be cached
+        :param seconds: time spent to create the value, used to estimate the latency saved
+        :return: None
+        """
+        with self._lock:
+            self.miss_seconds += seconds
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """
+        The function will remove all the cached values, the statistics are kept
+        :return: None
+        """
+        with self._lock:
+            self._data.clear()
+
+    def report(self, name):
+        """
+        The function will create the cache statistics report
+        :param name: cache name
+        :return: report string
+        """
+        lookups = self.hits + self.misses
+        hit_rate = 100 * self.hits / lookups if lookups else 0.0
+        saved = self.hits * self.miss_seconds / self.misses if self.misses else 0.0
+        return (name + ' cache: ' + str(self.hits) + '/' + str(lookups) + ' hits (' +
+                format(hit_rate, '.1f') + '%), latency saved ' + format(saved, '.2f') + ' seconds')
+
+
+def normalize_query(text):
+    """
+    The function will normalize the query text, lower case and collapsed whitespace.
+    The all-MiniLM-L6-v2 model is uncased, the normalized text has the same embedding.
+    :param text: query text
+    :return: normalized text
+    """
+    return ' '.join(text.lower().split())
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings model wrapper that caches the query embeddings, keyed by the normalized query text
+    """
+
+    def __init__(self, embeddings, cache=None):
+        self.embeddings = embeddings
+        self.cache = cache or LRUCache()
+
+    def embed_documents(self, texts):
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text):
+        key = normalize_query(text)
+        found, vector = self.cache.get(key)
+        if found:
+            return vector
+        start_time = time.perf_counter()
+        vector = self.embeddings.embed_query(key)
+        self.cache.put(key, vector, time.perf_counter() - start_time)
+        return vector
+
+
+class CachedRetriever(BaseRetriever):
+    """
+    Chroma retriever that caches the retrieval results, keyed by the query vector, k and filter.
+    The cache is cleared when the collection id or count changes. The collection is resolved by
+    name when its id changes, after the collection is rebuilt by the compaction.
+    """
+
+    vector_store: Any
+    embeddings: Any
+    search_kwargs: dict = {'k': 4}
+    cache: Any = None
+    fingerprint: Any = None
+    checked_at: float = 0.0
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if self.cache is None:
+            self.cache = LRUCache()
+
+    def collection_fingerprint(self):
+        """
+        The function will identify the collection content, the collection id changes when the
+        collection is recreated or compacted, the count changes when new data is embedded
+        :return: collection id and count
+        """
+        # noinspection PyProtectedMember
+        collection = self.vector_store._client.get_collection(name=self.vector_store._collection.name)
+        if collection.id != self.vector_store._collection.id:
+            # noinspection PyProtectedMember
+            self.vector_store._chroma_collection = collection
+        return str(collection.id), collection.count()
+
+    def check_invalidation(self, force=False):
+        """
+        The function will clear the cached results if the collection changed since the last check
+        :param force: check now, not after the check interval
+        :return: None
+        """
+        if not force and time.monotonic() - self.checked_at < CACHE_CHECK_INTERVAL:
+            return
+        fingerprint = self.collection_fingerprint()
+        if fingerprint != self.fingerprint:
+            self.cache.clear()
+            self.fingerprint = fingerprint
+        self.checked_at = time.monotonic()
+
+    def _get_relevant_documents(self, query: str, *, run_manager=None) -> List[Document]:
+        self.check_invalidation()
+        vector = self.embeddings.embed_query(query)
+        k = self.search_kwargs.get('k', 4)
+        search_filter = self.search_kwargs.get('filter')
+        key = (hashlib.sha1(array('f', vector).tobytes()).hexdigest(), k,
+               json.dumps(search_filter, sort_keys=True))
+        found, docs = self.cache.get(key)
+        if found:
+            return list(docs)
+        start_time = time.perf_counter()
+        try:
+            docs = self.vector_store.similarity_search_by_vector(vector, k=k, filter=search_filter)
+        except Exception:
+            # the collection was replaced since the last check, it is resolved by name and the query retried
+            # noinspection PyProtectedMember
+            collection_id = self.vector_store._collection.id
+            self.check_invalidation(force=True)
+            if self.vector_store._collection.id == collection_id:
+                raise
+            docs = self.vector_store.similarity_search_by_vector(vector, k=k, filter=search_filter)
+        self.cache.put(key, docs, time.perf_counter() - start_time)
+        return list(docs)
+
+
+def cosine_similarity(first, second):
+    """
+    The function will calculate the cosine similarity of two vectors
+    :param first: vector
+    :param second: vector
+    :return: similarity, -1 to 1
+    """
+    dot = sum(a * b for a, b in zip(first, second))
+    norm = math.sqrt(sum(a * a for a in first)) * math.sqrt(sum(b * b for b in second))
+    return dot / norm if norm else 0.0
+
+
+class SemanticAnswerCache(LRUCache):
+    """
+    LLM answers cache, keyed by the query embedding and the retrieved chunk ids. A stored answer
+    is returned when the query is similar, above the threshold, and the retrieved chunks are the
+    same. The answers expire after the TTL, and are cleared when the collection changes.
+    """
+
+    def __init__(self, maxsize=ANSWER_CACHE_SIZE, ttl=ANSWER_CACHE_TTL, threshold=ANSWER_CACHE_THRESHOLD):
+        super().__init__(maxsize)
+        self.ttl = ttl
+        self.threshold = threshold
+        self.fingerprint = None
+
+    def check_invalidation(self, fingerprint):
+        """
+        The function will clear the answers if the collection changed
+        :param fingerprint: collection fingerprint, from CachedRetriever
+        :return: None
+        """
+        if fingerprint is not None and fingerprint != self.fingerprint:
+            self.clear()
+            self.fingerprint = fingerprint
+
+    def get(self, vector, chunk_ids):
+        """
+        The function will return the answer of the most similar cached query, with the same chunks
+        :param vector: query embedding
+        :param chunk_ids: retrieved chunk ids
+        :return: found flag, cached answer
+        """
+        now = time.monotonic()
+        with self._lock:
+            best_key = None
+            best_similarity = self.threshold
+            for key, entry in list(self._data.items()):
+                if now - entry['created'] > self.ttl:
+                    del self._data[key]
+                    continue
+                if entry['chunk ids'] != chunk_ids:
+                    continue
+                similarity = cosine_similarity(vector, entry['vector'])
+                if similarity >= best_similarity:
+                    best_key = key
+                    best_similarity = similarity
+            if best_key is None:
+                self.misses += 1
+                return False, None
+            self._data.move_to_end(best_key)
+            self.hits += 1
+            return True, self._data[best_key]['answer']
+
+    def put(self, vector, chunk_ids, answer, seconds=0.0):
+        """
+        The function will save the answer to the cache, evicting the least recently used answer
+        :param vector: query embedding
+        :param chunk_ids: retrieved chunk ids
+        :param answer: LLM answer
+        :param seconds: time spent to create the answer, used to estimate the latency saved
+        :return: None
+        """
+        key = (hashlib.sha1(array('f', vector).tobytes()).hexdigest(), hash(chunk_ids))
+        entry = {'vector': vector, 'chunk ids': chunk_ids, 'answer': answer, 'created': time.monotonic()}
+        super().put(key, entry, seconds)
@@ -0,0 +1,339 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import logging
+import os
+import threading
+import time
+
+from operator import itemgetter
+
+from dotenv import load_dotenv
+
+# langchain, torch and sentence-transformers are imported by IssuesPilot.load(), in the
+# background, the prompt is shown before they are loaded
+
+load_dotenv('environment.env')
+
+# database server details
+DB_SERVER = os.getenv('DB_SERVER')
+DB_PORT = int(os.getenv('DB_PORT'))
+DB_COLLECTION = os.getenv('DB_COLLECTION')
+
+os.environ['TOKENIZERS_PARALLELISM'] = 'false'
+
+# Embeddings model
+MODEL_NAME = os.getenv('MODEL_NAME')
+
+# LLM config
+OPENAI_MODEL = os.getenv('OPENAI_MODEL')
+CLAUDE_API_KEY = os.getenv('CLAUDE_API_KEY')
+CLAUDE_MODEL = os.getenv('CLAUDE_MODEL')
+
+BACKENDS = ['openai', 'anthropic', 'stub']
+MODES = ['query', 'conversation']
+
+# number of proximity matches for each backend, and number of fused chunks sent to the LLM
+VECTOR_K = {'openai': 8, 'anthropic': 10, 'stub': 8}
+HYBRID_K = 6
+
+query_prompt_text = (
+    "You are an assistant for network troubleshooting tasks. "
+    "Use the following pieces of retrieved context to answer "
+    "the question. If you don't know the answer, say that you "
+    "don't know. The user is networking knowledgeable."
+)
+
+conversation_prompt_text = (
+    "You are an assistant for network troubleshooting tasks. "
+    "Use the following pieces of retrieved context to answer the question. "
+    "Consider the conversation history when answering follow-up questions. "
+    "If the user refers to previous topics (like 'that', 'it', 'those steps'), "
+    "use the chat history to understand what they're referring to. "
+    "If you don't know the answer, say that you don't know. "
+    "The user is networking knowledgeable."
+)
+
+
+def create_llm(backend):
+    """
+    The function will create the LLM client for the backend, the provider package is imported
+    only for the backend used
+    :param backend: openai, anthropic or stub
+    :return: LLM chat model
+    """
+    if backend == 'openai':
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(model_name=OPENAI_MODEL, temperature=1)
+    if backend == 'anthropic':
+        from langchain_anthropic import ChatAnthropic
+        return ChatAnthropic(model=CLAUDE_MODEL, anthropic_api_key=CLAUDE_API_KEY, temperature=1, max_tokens=1024)
+    from stub_llm import create_stub_llm
+    return create_stub_llm()
+
+
+class IssuesPilot:
+    """
+    The IssuesPilot retriever, LLM and chains, shared by the client apps and the HTTP service.
+    The heavy imports and the embeddings model are loaded in a background thread, the first
+    question waits for them.
+    """
+
+    def __init__(self, backend='openai', mode='conversation', background=True, collection_name=DB_COLLECTION,
+                 index_path=None):
+        self.backend = backend
+        self.mode = mode
+        self.collection_name = collection_name
+        self.index_path = index_path
+        self.error = None
+        self.load_seconds = None
+        self.ready = threading.Event()
+        if background:
+            threading.Thread(target=self.load, name='issues-pilot-load', daemon=True).start()
+        else:
+            self.load()
+            self.wait_ready()
+
+    def load(self):
+        """
+        The function will import the langchain packages, load the embeddings model, and create the
+        Chroma connection, the retrievers, the LLM client and the chains
+        :return: None
+        """
+        start_time = time.perf_counter()
+        try:
+            import chromadb
+            from langchain.chains import create_retrieval_chain
+            from langchain.chains.combine_documents import create_stuff_documents_chain
+            from langchain_chroma import Chroma
+            from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+            from langchain_core.runnables import RunnableLambda
+            from langchain_huggingface import HuggingFaceEmbeddings
+
+            from context_packer import ContextPacker
+            from hybrid_retriever import BM25Index, HybridRetriever
+            from issues_pilot_cache import CachedEmbeddings, CachedRetriever, SemanticAnswerCache
+
+            # Chroma DB server details and connection
+            chroma_db_server = chromadb.HttpClient(host=DB_SERVER, port=DB_PORT)
+
+            # Define the embeddings model, the query embeddings are cached
+            self.embeddings = CachedEmbeddings(HuggingFaceEmbeddings(model_name=MODEL_NAME))
+
+            # Chroma DB connection to server and collection
+            self.chroma_db = Chroma(
+                client=chroma_db_server,
+                collection_name=self.collection_name,
+                embedding_function=self.embeddings
+            )
+
+            # Define retriever from Chroma DB and number of proximity matches, the results are cached
+            self.vector_retriever = CachedRetriever(vector_store=self.chroma_db, embeddings=self.embeddings,
+                                                    search_kwargs={"k": VECTOR_K[self.backend]})
+
+            # Define the hybrid retriever, fusing the BM25 lexical matches and the proximity matches
+            index = BM25Index(self.index_path).load() if self.index_path else None
+            self.retriever = HybridRetriever(vector_retriever=self.vector_retriever, k=HYBRID_K, index=index)
+
+            # Merge the overlapping chunks and pack the context within the token budget, the retrieval
+            # chains pass the input dict, the retriever is invoked with the user input
+            self.context_packer = ContextPacker()
+            context_retriever = itemgetter("input") | self.retriever | RunnableLambda(self.context_packer.pack)
+
+            # Define the LLM used, the answers to repeated questions are cached
+            self.llm = create_llm(self.backend)
+            self.answer_cache = SemanticAnswerCache()
+
+            # Create the query and conversational retrieval chains
+            query_prompt = ChatPromptTemplate.from_messages([
+                ("system", query_prompt_text + "\n\nRetrieved Context:\n{context}"),
+                ("human", "{input}"),
+            ])
+            self.query_answer_chain = create_stuff_documents_chain(self.llm, query_prompt)
+            self.query_chain = create_retrieval_chain(context_retriever, self.query_answer_chain)
+
+            conversation_prompt = ChatPromptTemplate.from_messages([
+                ("system", conversation_prompt_text + "\n\nRetrieved Context:\n{context}"),
+                MessagesPlaceholder("chat_history"),
+                ("human", "{input}"),
+            ])
+            self.conversation_answer_chain = create_stuff_documents_chain(self.llm, conversation_prompt)
+            self.conversational_chain = create_retrieval_chain(context_retriever, self.conversation_answer_chain)
+
+            # Anthropic messages builder, the system prompt and retrieved context are cached across turns
+            if self.backend == 'anthropic':
+                from anthropic_prompt_cache import CachedPromptBuilder
+                self.prompt_builder = CachedPromptBuilder(
+                    conversation_prompt_text if self.mode == 'conversation' else query_prompt_text)
+        except Exception as error:
+            self.error = error
+        finally:
+            self.load_seconds = time.perf_counter() - start_time
+            self.ready.set()
+
+    def wait_ready(self):
+        """
+        The function will wait for the background loading to complete
+        :return: None
+        """
+        self.ready.wait()
+        if self.error is not None:
+            raise self.error
+
+    def answer_cache_key(self, query, retrieved_docs):
+        """
+        The function will create the semantic answer cache key, and clear the cached answers if
+        the collection changed
+        :param query: user input
+        :param retrieved_docs: retrieved documents, before the context packing
+        :return: query embedding, retrieved chunk ids
+        """
+        from hybrid_retriever import document_key
+
+        self.answer_cache.check_invalidation(self.vector_retriever.fingerprint)
+        return self.embeddings.embed_query(query), frozenset(document_key(doc) for doc in retrieved_docs)
+
+    def answer(self, query, chat_history=None, stream=False):
+        """
+        The function will answer the query and print the answer. The answers to the questions
+        without chat history are cached, a similar question with the same retrieved chunks is
+        answered from the cache.
+        :param query: user input
+        :param chat_history: optional, ConversationHistory for the conversation mode
+        :param stream: print the answer tokens as they arrive
+        :return: answer
+        """
+        from issues_pilot_stream import format_sources, stream_response
+
+        self.wait_ready()
+        start_time = time.perf_counter()
+        history = chat_history.get_messages() if chat_history is not None else []
+
+        # Retrieve documents, merge the overlapping chunks and pack the context
+        retrieved_docs = self.retriever.invoke(query)
+        context_stats = {}
+        matching_docs = self.context_packer.pack(retrieved_docs, stats=context_stats)
+
+        # Check the semantic answer cache, the follow-up questions depend on the chat history
+        cache_key = None
+        if not history:
+            cache_key = self.answer_cache_key(query, retrieved_docs)
+            found, answer = self.answer_cache.get(*cache_key)
+            if found:
+                print(format_sources(matching_docs))
+                print('IssuesPilot (cached answer): ' + answer + '\n')
+                return answer
+
+        if self.backend == 'anthropic':
+            from anthropic_prompt_cache import message_text, stream_tokens, usage_report
+
+            # Create the messages, with the cacheable prefix
+            messages = self.prompt_builder.build_messages(matching_docs, history, query)
+            if stream:
+                print(format_sources(matching_docs))
+                response = {}
+                answer, metrics = stream_response(stream_tokens(self.llm, messages, response), start_time)
+                message = response['message']
+            else:
+                message = self.llm.invoke(messages)
+                answer = message_text(message)
+                print('IssuesPilot: ' + answer + '\n')
+            logging.info(' ' + usage_report(message.usage_metadata))
+        else:
+            chain = self.conversation_answer_chain if self.mode == 'conversation' else self.query_answer_chain
+            inputs = {"context": matching_docs, "input": query, "chat_history": history}
+            if stream:
+                print(format_sources(matching_docs))
+                answer, metrics = stream_response(chain.stream(inputs), start_time)
+            else:
+                answer = chain.invoke(inputs)
+                print('IssuesPilot: ' + answer + '\n')
+        print(self.context_packer.report(context_stats) + '\n')
+
+        if cache_key is not None:
+            self.answer_cache.put(*cache_key, answer, time.perf_counter() - start_time)
+        return answer
+
+    def report(self):
+        """
+        The function will create the caches report
+        :return: report string
+        """
+        if not self.ready.is_set() or self.error is not None:
+            return ''
+        return (self.embeddings.cache.report('Query embeddings') + '\n' +
+                self.vector_retriever.cache.report('Retrieval results') + '\n' +
+                self.answer_cache.report('Semantic answers'))
+
+
+def run_cli(backend, mode):
+    """
+    The function will run the IssuesPilot terminal client. The prompt is shown while the
+    models are loaded in the background.
+    :param backend: openai, anthropic or stub
+    :param mode: query or conversation
+    :return: None
+    """
+
+    # parse the input arguments
+    parser = argparse.ArgumentParser(description="IssuesPilot network troubleshooting assistant")
+    parser.add_argument("--stream", action="store_true", help="Print the answer tokens as they arrive")
+    if mode == 'conversation':
+        parser.add_argument("--session", help="Save the conversation with this name, and resume it if it exists")
+    args = parser.parse_args()
+
+    # logging, info level
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+
+    pilot = IssuesPilot(backend=backend, mode=mode)
+
+    print('\nHi, I am your IssuesPilot! Enter your query or press Enter to end.\n')
+
+    chat_history = None
+
+    while True:
+        # Prompt user for input
+        query = input("Your input: ").strip()
+
+        if query == '':
+            print('\n' + pilot.report())
+            print('\nIssuesPilot. Goodbye!\n')
+            break
+
+        # Initialize chat history, token-aware with a running summary of the older turns
+        if mode == 'conversation' and chat_history is None:
+            pilot.wait_ready()
+            from conversation_history import ConversationHistory
+            chat_history = ConversationHistory(pilot.llm, session_id=args.session)
+            if chat_history.load():
+                print('Resumed the conversation: ' + args.session + '\n')
+
+        answer = pilot.answer(query, chat_history=chat_history, stream=args.stream)
+
+        # Update chat history, the older turns are summarized in the background
+        if chat_history is not None:
+            chat_history.add_turn(query, answer)
+            chat_history.save()
+
+    return
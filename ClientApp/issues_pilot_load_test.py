@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+import aiohttp
+
+# the latency percentiles are shared with the benchmark
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common'))
+
+from latency_stats import percentile  # noqa: E402
+
+# logging, info level
+logging.basicConfig(level=logging.INFO)
+
+# operator questions, each session sends them in order
+QUERIES = [
+    "Can you check the active issues, devices impacted and provide a summary of your findings",
+    "What is wrong with PDX-RO?",
+    "Are there any ACLs blocking BGP on PDX-RN?",
+    "What configuration changes were made before the BGP session went down?",
+    "Which steps do you recommend to fix it?",
+]
+
+
+async def operator_session(http_session, url, session_id, turns, latencies, errors):
+    """
+    The function will simulate one operator conversation
+    :param http_session: aiohttp client session
+    :param url: IssuesPilot service URL
+    :param session_id: conversation session id
+    :param turns: number of questions
+    :param latencies: list to append the request latencies
+    :param errors: list to append the failed requests status
+    :return: None
+    """
+    for turn in range(turns):
+        payload = {'session_id': session_id, 'query': QUERIES[turn % len(QUERIES)]}
+        start_time = time.perf_counter()
+        async with http_session.post(url + '/conversation', json=payload) as response:
+            await response.read()
+            if response.status == 200:
+                latencies.append(time.perf_counter() - start_time)
+            else:
+                errors.append(response.status)
+    async with http_session.delete(url + '/sessions/' + session_id) as response:
+        await response.read()
+
+
+async def run_load_test(url, operators, turns):
+    """
+    The function will run the operator sessions concurrently and report the results
+    :param url: IssuesPilot service URL
+    :param operators: number of concurrent operators
+    :param turns: number of questions for each operator
+    :return: None
+    """
+    latencies = []
+    errors = []
+    start_time = time.perf_counter()
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=600)) as http_session:
+        await asyncio.gather(*[operator_session(http_session, url, 'operator-' + str(operator), turns,
+                                                latencies, errors)
+                               for operator in range(operators)])
+        async with http_session.get(url + '/health') as response:
+            health = await response.json()
+    duration = time.perf_counter() - start_time
+
+    logging.info(' Operators: ' + str(operators) + ', questions each: ' + str(turns))
+    logging.info(' Completed: ' + str(len(latencies)) + ', failed: ' + str(len(errors)))
+    logging.info(' Throughput: ' + format(len(latencies) / duration, '.2f') + ' requests/second')
+    logging.info(' Latency p50: ' + format(percentile(latencies, 50), '.3f') + ' s, p95: ' +
+                 format(percentile(latencies, 95), '.3f') + ' s, max: ' + format(max(latencies, default=0.0), '.3f') + ' s')
+    logging.info(' Service: ' + str(health))
+
+
+def main():
+    """
+    This app will load test the IssuesPilot HTTP service. Start the service with the stub
+    LLM backend, python issues_pilot_server.py --llm stub, to test without the LLM providers.
+    """
+
+    # parse the input arguments
+    parser = argparse.ArgumentParser(description="IssuesPilot HTTP service load test")
+    parser.add_argument("--url", default='http://127.0.0.1:8080', help="The IssuesPilot service URL")
+    parser.add_argument("--operators", type=int, default=20, help="Number of concurrent operators")
+    parser.add_argument("--turns", type=int, default=5, help="Number of questions for each operator")
+    args = parser.parse_args()
+
+    asyncio.run(run_load_test(args.url, args.operators, args.turns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+from collections import OrderedDict
+
+from aiohttp import web
+
+from conversation_history import ConversationHistory
+from issues_pilot_core import BACKENDS, IssuesPilot
+from issues_pilot_stream import format_sources
+
+# logging, info level
+logging.basicConfig(level=logging.INFO)
+logging.getLogger('httpx').setLevel(logging.WARNING)
+logging.getLogger('chromadb.telemetry').setLevel(logging.WARNING)
+
+# server config
+SERVER_HOST = os.getenv('PILOT_SERVER_HOST', '127.0.0.1')
+SERVER_PORT = int(os.getenv('PILOT_SERVER_PORT', '8080'))
+MAX_CONCURRENCY = int(os.getenv('PILOT_MAX_CONCURRENCY', '8'))
+MAX_QUEUE = int(os.getenv('PILOT_MAX_QUEUE', '64'))
+
+# the conversation sessions idle for {PILOT_SESSION_TTL} seconds are ended, and the least recently
+# used sessions are ended above {PILOT_MAX_SESSIONS}
+SESSION_TTL = int(os.getenv('PILOT_SESSION_TTL', '3600'))
+MAX_SESSIONS = int(os.getenv('PILOT_MAX_SESSIONS', '1000'))
+
+
+async def request_fields(request, fields):
+    """
+    The function will read the JSON request body, and check the required fields
+    :param request: HTTP request
+    :param fields: list of the required fields
+    :return: request data
+    """
+    try:
+        data = await request.json()
+    except ValueError:
+        raise web.HTTPBadRequest(text='The request body is not valid JSON')
+    if not isinstance(data, dict):
+        raise web.HTTPBadRequest(text='The request body is not a JSON object')
+    missing = [field for field in fields if data.get(field) in [None, '']]
+    if missing:
+        raise web.HTTPBadRequest(text='Missing required fields: ' + ', '.join(missing))
+    return data
+
+
+class IssuesPilotService:
+    """
+    The query and conversational chains, shared by all the HTTP sessions, with per-session
+    chat history and bounded concurrency. Each session has a lock, a chat history and the last
+    used time, the sessions are kept in the least recently used order.
+    """
+
+    def __init__(self, backend):
+        # one Chroma client, embeddings model and LLM client for all the sessions, the LLM client
+        # HTTP connection pool is reused by the concurrent requests
+        self.pilot = IssuesPilot(backend=backend, background=False)
+        self.llm = self.pilot.llm
+        self.conversational_chain = self.pilot.conversational_chain
+
+        self.sessions = OrderedDict()
+        self.semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+        self.waiting = 0
+        self.active = 0
+        self.completed = 0
+
+    async def run(self, work):
+        """
+        The function will run the request work when a concurrency slot is available. The requests
+        wait in the queue, up to {MAX_QUEUE} requests, the other requests are rejected.
+        :param work: coroutine function, the retrieval and the chain of the request
+        :return: work response
+        """
+        if self.waiting >= MAX_QUEUE:
+            raise web.HTTPServiceUnavailable(text='IssuesPilot queue is full, retry later')
+        self.waiting += 1
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        try:
+            return await work()
+        finally:
+            self.active -= 1
+            self.completed += 1
+            self.semaphore.release()
+
+    def lookup(self, query):
+        """
+        The function will retrieve and pack the context, and check the semantic answer cache.
+        The query embedding and the cache scan are blocking, it runs in the executor.
+        :param query: user input
+        :return: packed documents, answer cache key, found flag, cached answer
+        """
+        retrieved_docs = self.pilot.retriever.invoke(query)
+        matching_docs = self.pilot.context_packer.pack(retrieved_docs)
+        cache_key = self.pilot.answer_cache_key(query, retrieved_docs)
+        found, answer = self.pilot.answer_cache.get(*cache_key)
+        return matching_docs, cache_key, found, answer
+
+    def expire_sessions(self):
+        """
+        The function will end the sessions idle for {SESSION_TTL} seconds, and the least recently
+        used sessions above {MAX_SESSIONS}, before a session is added. The sessions running a turn
+        are kept.
+        :return: None
+        """
+        now = time.monotonic()
+        for session_id, session in list(self.sessions.items()):
+            if now - session['last used'] < SESSION_TTL and len(self.sessions) < MAX_SESSIONS:
+                break
+            if session['lock'].locked():
+                continue
+            session['ended'] = True
+            del self.sessions[session_id]
+
+    def get_session(self, session_id):
+        """
+        The function will return the session, or create it
+        :param session_id: conversation session id
+        :return: session dict, lock, chat history, last used time and ended flag
+        """
+        self.expire_sessions()
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = {'lock': asyncio.Lock(), 'history': ConversationHistory(self.llm), 'ended': False}
+            self.sessions[session_id] = session
+        session['last used'] = time.monotonic()
+        self.sessions.move_to_end(session_id)
+        return session
+
+    async def query(self, request):
+        data = await request_fields(request, ['query'])
+        start_time = time.perf_counter()
+
+        # the answers to similar questions, with the same retrieved chunks, are cached
+        async def answer_query():
+            loop = asyncio.get_running_loop()
+            docs, cache_key, cached, cached_answer = await loop.run_in_executor(None, self.lookup, data['query'])
+            if cached:
+                return docs, cached, cached_answer
+            response = await self.pilot.query_answer_chain.ainvoke({"context": docs, "input": data['query']})
+            self.pilot.answer_cache.put(*cache_key, response, time.perf_counter() - start_time)
+            return docs, cached, response
+
+        matching_docs, found, answer = await self.run(answer_query)
+        return web.json_response({'answer': answer,
+                                  'sources': format_sources(matching_docs),
+                                  'cached': found,
+                                  'latency': time.perf_counter() - start_time})
+
+    async def conversation(self, request):
+        data = await request_fields(request, ['session_id', 'query'])
+        session_id = str(data['session_id'])
+        start_time = time.perf_counter()
+        # one turn at a time for each session, the chat history is updated in order. A session
+        # ended while the turn waited for the lock is replaced by a new session.
+        while True:
+            session = self.get_session(session_id)
+            async with session['lock']:
+                if session['ended']:
+                    continue
+                inputs = {"input": data['query'], "chat_history": session['history'].get_messages()}
+                response = await self.run(lambda: self.conversational_chain.ainvoke(inputs))
+                session['history'].add_turn(data['query'], response['answer'])
+                session['last used'] = time.monotonic()
+                break
+        return web.json_response({'answer': response['answer'],
+                                  'sources': format_sources(response['context']),
+                                  'latency': time.perf_counter() - start_time})
+
+    async def end_session(self, request):
+        session_id = request.match_info['session_id']
+        session = self.sessions.get(session_id)
+        if session is not None:
+            # the running turn of the session completes first
+            async with session['lock']:
+                session['ended'] = True
+                if self.sessions.get(session_id) is session:
+                    del self.sessions[session_id]
+        return web.json_response({'session_id': session_id, 'status': 'ended'})
+
+    async def health(self, request):
+        return web.json_response({'sessions': len(self.sessions),
+                                  'active': self.active,
+                                  'waiting': self.waiting,
+                                  'completed': self.completed,
+                                  'caches': self.pilot.report()})
+
+
+def create_app(backend):
+    """
+    The function will create the HTTP application and routes
+    :param backend: LLM backend
+    :return: aiohttp application
+    """
+    service = IssuesPilotService(backend)
+    app = web.Application()
+    app.add_routes([
+        web.post('/query', service.query),
+        web.post('/conversation', service.conversation),
+        web.delete('/sessions/{session_id}', service.end_session),
+        web.get('/health', service.health),
+    ])
+    return app
+
+
+def main():
+    """
+    This app will run IssuesPilot as a local HTTP service, for many operators at once.
+    The embeddings model, Chroma client and LLM client are loaded once and shared.
+    Endpoints:
+    - POST /query {"query"}
+    - POST /conversation {"session_id", "query"}
+    - DELETE /sessions/{session_id}
+    - GET /health
+    """
+
+    # parse the input arguments
+    parser = argparse.ArgumentParser(description="IssuesPilot HTTP service")
+    parser.add_argument("--llm", choices=BACKENDS, default='openai', help="The LLM backend")
+    args = parser.parse_args()
+
+    logging.info(' IssuesPilot service starting, LLM backend: ' + args.llm)
+    web.run_app(create_app(args.llm), host=SERVER_HOST, port=SERVER_PORT)
+
+
+if __name__ == "__main__":
+    main()
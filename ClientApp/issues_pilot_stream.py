@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import time
+
+
+def format_sources(docs):
+    """
+    The function will format the retrieved documents metadata, one line for each device and command
+    :param docs: retrieved documents
+    :return: sources string
+    """
+    sources = []
+    for doc in docs:
+        source = (doc.metadata.get('device name', '') + ' ' + doc.metadata.get('CLI command', '')).strip()
+        if not source:
+            source = doc.metadata.get('source', 'unknown')
+        if source not in sources:
+            sources.append(source)
+    return 'Sources: ' + ', '.join(sources)
+
+
+def stream_response(chunks, start_time):
+    """
+    The function will print the response tokens as they arrive. The chunks are strings for the
+    question answer chain, or dicts for the retrieval chain, where the retrieved context arrives
+    before the answer tokens and the sources are printed first.
+    :param chunks: response chunks iterator, from the chain stream() interface
+    :param start_time: turn start time, from time.perf_counter()
+    :return: answer, dict with the time to first token and total latency, in seconds
+    """
+    answer = ''
+    first_token_time = None
+    for chunk in chunks:
+        if isinstance(chunk, dict):
+            if 'context' in chunk:
+                print(format_sources(chunk['context']))
+            token = chunk.get('answer', '')
+        else:
+            token = chunk
+        if not token:
+            continue
+        if first_token_time is None:
+            first_token_time = time.perf_counter()
+            print('IssuesPilot: ', end='', flush=True)
+        print(token, end='', flush=True)
+        answer += token
+    end_time = time.perf_counter()
+    if first_token_time is None:
+        first_token_time = end_time
+    metrics = {'time to first token': first_token_time - start_time, 'total latency': end_time - start_time}
+    print('\n\n[time to first token ' + format(metrics['time to first token'], '.2f') + ' s, total latency ' +
+          format(metrics['total latency'], '.2f') + ' s]\n')
+    return answer, metrics
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# each measurement runs in a new interpreter, the imports are not cached between runs
+MEASUREMENTS = {
+    'eager imports (previous client apps)': '''
+import time
+start_time = time.perf_counter()
+import chromadb
+from langchain_chroma import Chroma
+from langchain_huggingface import HuggingFaceEmbeddings
+from langchain.chains import create_retrieval_chain
+from langchain.chains.combine_documents import create_stuff_documents_chain
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+print(time.perf_counter() - start_time)
+''',
+    'issues_pilot_core import': '''
+import time
+start_time = time.perf_counter()
+import issues_pilot_core
+print(time.perf_counter() - start_time)
+''',
+    'time to prompt': '''
+import time
+start_time = time.perf_counter()
+from issues_pilot_core import IssuesPilot
+pilot = IssuesPilot(backend='stub', mode='conversation')
+print(time.perf_counter() - start_time)
+''',
+    'time to ready (models loaded, Chroma connected)': '''
+import time
+start_time = time.perf_counter()
+from issues_pilot_core import IssuesPilot
+pilot = IssuesPilot(backend='stub', mode='conversation')
+pilot.wait_ready()
+print(time.perf_counter() - start_time)
+''',
+}
+
+
+def measure(code, runs):
+    """
+    The function will run the code in new interpreters and collect the elapsed times
+    :param code: code printing the elapsed time, in seconds
+    :param runs: number of runs
+    :return: list of elapsed times, or the error message
+    """
+    results = []
+    for run in range(runs):
+        process = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                 cwd=os.path.dirname(os.path.abspath(__file__)))
+        if process.returncode != 0:
+            return process.stderr.strip().splitlines()[-1]
+        results.append(float(process.stdout.strip().splitlines()[-1]))
+    return results
+
+
+def main():
+    """
+    This app will benchmark the client apps import time and startup time. The time to prompt
+    is the time until the user can type a question, the models are loaded in the background.
+    """
+
+    # parse the input arguments
+    parser = argparse.ArgumentParser(description="IssuesPilot import time and startup benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Number of runs for each measurement")
+    parser.add_argument("--json", help="Save the results to this JSON file")
+    args = parser.parse_args()
+
+    report = {}
+    for name, code in MEASUREMENTS.items():
+        results = measure(code, args.runs)
+        if isinstance(results, str):
+            report[name] = {'error': results}
+            print(name + ': failed, ' + results)
+            continue
+        report[name] = {'median': statistics.median(results), 'min': min(results), 'max': max(results)}
+        print(name + ': median ' + format(report[name]['median'], '.3f') + ' s, min ' +
+              format(report[name]['min'], '.3f') + ' s, max ' + format(report[name]['max'], '.3f') + ' s')
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import os
+import time
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+# stub LLM response time, in seconds
+STUB_LATENCY = float(os.getenv('PILOT_STUB_LATENCY', '0.5'))
+
+
+class StubChatModel(FakeListChatModel):
+    """
+    Deterministic local LLM, used for load tests without calling the LLM providers.
+    It waits {latency} seconds and returns the next response. The async calls run in the
+    executor, the event loop is not blocked.
+    """
+
+    latency: float = STUB_LATENCY
+
+    def _call(self, *args, **kwargs):
+        time.sleep(self.latency)
+        return super()._call(*args, **kwargs)
+
+
+def create_stub_llm(latency=STUB_LATENCY):
+    """
+    The function will create the stub LLM
+    :param latency: response time, in seconds
+    :return: stub chat model
+    """
+    return StubChatModel(responses=['IssuesPilot stub answer, the retrieved context was received.'],
+                         latency=latency)
@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu PTME"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import fcntl
+import json
+import logging
+import math
+import os
+import re
+import threading
+
+from collections import Counter
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# tokens keep the dots, dashes, colons and slashes inside IP addresses, hostnames, interfaces
+TOKEN_PATTERN = re.compile(r'[a-z0-9](?:[a-z0-9._:/-]*[a-z0-9])?')
+
+
+def index_path():
+    """
+    The function will return the index file, created by the embeddings app and used by the client
+    apps, {BM25_INDEX} environment variable, or bm25_index.json in the {APPS_PATH} folder. The
+    environment is read when the index is created, after the apps load the environment file.
+    :return: file path
+    """
+    return os.getenv('BM25_INDEX') or os.path.join(os.getenv('APPS_PATH') or '.', 'bm25_index.json')
+
+
+def tokenize(text):
+    """
+    The function will split the text in lower case tokens. IP addresses (10.93.141.42), hostnames
+    (pdx-rn) and interfaces (gigabitethernet1/0/1) are kept as one token, the prefixes and
+    interfaces are also split in parts, 10.93.141.42/32 matches 10.93.141.42.
+    :param text: text to be tokenized
+    :return: tokens list
+    """
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(token)
+        if '/' in token or ':' in token:
+            tokens.extend(part for part in re.split(r'[/:]', token) if part)
+    return tokens
+
+
+def identifier_tokens(text):
+    """
+    The function will return the exact identifiers in the text, the tokens with digits, dots or
+    dashes: IP addresses, ACL sequence numbers, hostnames, AS numbers
+    :param text: query text
+    :return: identifier tokens list
+    """
+    return [token for token in tokenize(text) if any(char.isdigit() or char in '.-' for char in token)]
+
+
+class BM25Index:
+    """
+    BM25 inverted index of the collection chunks, keyed by the Chroma ids. The chunk content and
+    metadata are saved with the index, the lexical matches do not require a vector search.
+    The docs, postings and total length are one state, replaced when the index is reloaded, each
+    search uses the state it started with.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or index_path()
+        self.state = {'docs': {}, 'postings': {}, 'total_length': 0}
+        self.mtime = None
+        # the chunks added, or removed (None), since the last save, replayed on the latest file
+        self.pending = {}
+        self._lock = threading.Lock()
+        self._reloading = False
+
+    @property
+    def docs(self):
+        return self.state['docs']
+
+    @property
+    def postings(self):
+        return self.state['postings']
+
+    @property
+    def total_length(self):
+        return self.state['total_length']
+
+    @total_length.setter
+    def total_length(self, value):
+        self.state['total_length'] = value
+
+    def add(self, ids, documents, metadatas):
+        """
+        The function will add the chunks to the index
+        :param ids: Chroma ids
+        :param documents: chunks content
+        :param metadatas: chunks metadata
+        :return: None
+        """
+        for chunk_id, document, metadata in zip(ids, documents, metadatas):
+            self.remove([chunk_id])
+            self.pending[chunk_id] = (document, metadata)
+            term_counts = Counter(tokenize(document))
+            length = sum(term_counts.values())
+            self.docs[chunk_id] = {'text': document, 'metadata': metadata, 'length': length}
+            self.total_length += length
+            for term, count in term_counts.items():
+                self.postings.setdefault(term, {})[chunk_id] = count
+
+    def remove(self, ids):
+        """
+        The function will remove the chunks from the index
+        :param ids: Chroma ids
+        :return: None
+        """
+        for chunk_id in ids:
+            self.pending[chunk_id] = None
+            doc = self.docs.pop(chunk_id, None)
+            if doc is None:
+                continue
+            self.total_length -= doc['length']
+            for term in set(tokenize(doc['text'])):
+                postings = self.postings.get(term, {})
+                postings.pop(chunk_id, None)
+                if not postings:
+                    self.postings.pop(term, None)
+
+    def sync(self, collection_ids):
+        """
+        The function will remove the chunks no longer in the collection
+        :param collection_ids: the ids of all the collection chunks
+        :return: number of chunks removed
+        """
+        stale_ids = set(self.docs) - set(collection_ids)
+        self.remove(stale_ids)
+        return len(stale_ids)
+
+    def save(self):
+        """
+        The function will save the index to file. The file is locked while it is saved, if another
+        app saved it since it was loaded, the latest file is loaded and the changes of this app are
+        applied to it, no update is lost. The file is replaced atomically, the client apps never
+        read a partial index.
+        :return: None
+        """
+        with open(self.path + '.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                if os.path.exists(self.path) and os.path.getmtime(self.path) != self.mtime:
+                    pending = self.pending
+                    self.load()
+                    for chunk_id, chunk in pending.items():
+                        if chunk is None:
+                            self.remove([chunk_id])
+                        else:
+                            self.add([chunk_id], [chunk[0]], [chunk[1]])
+                temp_path = self.path + '.tmp'
+                with open(temp_path, 'w') as f:
+                    json.dump({'docs': self.docs, 'postings': self.postings, 'total_length': self.total_length}, f)
+                os.replace(temp_path, self.path)
+                self.mtime = os.path.getmtime(self.path)
+                self.pending = {}
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def load(self):
+        """
+        The function will load the index from file, an empty index if the file does not exist
+        :return: the index
+        """
+        if not os.path.exists(self.path):
+            return self
+        mtime = os.path.getmtime(self.path)
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        state = {'docs': data['docs'], 'postings': data['postings'], 'total_length': data['total_length']}
+        with self._lock:
+            self.state = state
+            self.mtime = mtime
+        return self
+
+    def reload_if_changed(self):
+        """
+        The function will reload the index when the file was updated by the embeddings app. The
+        file is loaded in a background thread, the searches use the current index until it is
+        replaced.
+        :return: None
+        """
+        if not os.path.exists(self.path) or os.path.getmtime(self.path) == self.mtime:
+            return
+        with self._lock:
+            if self._reloading:
+                return
+            self._reloading = True
+        threading.Thread(target=self._reload, name='bm25-index-reload', daemon=True).start()
+
+    def _reload(self):
+        """
+        The function will load the updated index file, in the background
+        :return: None
+        """
+        try:
+            self.load()
+        except Exception as error:
+            logging.info(' BM25 index reload failed, the loaded index is used: ' + str(error))
+        finally:
+            self._reloading = False
+
+    def search(self, query, k=10, required_terms=None):
+        """
+        The function will score the chunks with BM25
+        :param query: query text
+        :param k: number of results
+        :param required_terms: optional, only the chunks with all these terms are scored
+        :return: list of (chunk id, score, chunk), best score first
+        """
+        state = self.state
+        docs = state['docs']
+        if not docs:
+            return []
+        candidates = None
+        for term in required_terms or []:
+            term_ids = set(state['postings'].get(term, {}))
+            candidates = term_ids if candidates is None else candidates & term_ids
+        doc_count = len(docs)
+        average_length = state['total_length'] / doc_count or 1
+        scores = Counter()
+        for term in set(tokenize(query)):
+            postings = state['postings'].get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for chunk_id, count in postings.items():
+                if candidates is not None and chunk_id not in candidates:
+                    continue
+                length_norm = 1 - BM25_B + BM25_B * docs[chunk_id]['length'] / average_length
+                scores[chunk_id] += idf * count * (BM25_K1 + 1) / (count + BM25_K1 * length_norm)
+        return [(chunk_id, score, docs[chunk_id]) for chunk_id, score in scores.most_common(k)]
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+def percentile(values, percent):
+    """
+    The function will calculate the nearest-rank percentile, the value of the sample at the rank,
+    used by the benchmark and the load test, the results are comparable
+    :param values: list of values
+    :param percent: percentile, 0 to 100
+    :return: percentile value
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+
+def latency_stats(values):
+    """
+    The function will create the latency statistics, in milliseconds
+    :param values: list of latencies, in seconds
+    :return: dict with p50, p95, p99 and max
+    """
+    return {'p50 ms': round(1000 * percentile(values, 50), 2), 'p95 ms': round(1000 * percentile(values, 95), 2),
+            'p99 ms': round(1000 * percentile(values, 99), 2), 'max ms': round(1000 * max(values, default=0.0), 2)}
@@ -0,0 +1,322 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import datetime
+import json
+import os
+import secrets
+import threading
+import time
+
+# the collection app saves the trace of each dataset file to this hidden file, in the DATASET folder
+TRACE_MANIFEST = '.pipeline_trace.json'
+
+# chunk metadata keys, the trace is carried from the dataset files to the retrieval results
+TRACE_METADATA = ['trace_id', 'trace_span_id', 'issue_id', 'collected_at']
+
+_export_lock = threading.Lock()
+_retrieved_traces = set()
+
+
+def tracing_enabled():
+    """
+    The function will check if the pipeline tracing is enabled, {PIPELINE_TRACING} environment variable
+    :return: True or False
+    """
+    return os.getenv('PIPELINE_TRACING', 'true').lower() not in ['false', '0', 'no']
+
+
+def export_path():
+    """
+    The function will return the spans export file, {PIPELINE_TRACE_FILE} environment variable, or
+    pipeline_traces.jsonl in the {APPS_PATH} folder. The environment is read when the spans are
+    exported, after the apps load the environment file.
+    :return: file path
+    """
+    return os.getenv('PIPELINE_TRACE_FILE') or os.path.join(os.getenv('APPS_PATH') or '.', 'pipeline_traces.jsonl')
+
+
+def new_trace_id():
+    """
+    The function will create a trace id, 16 random bytes in hex, the run correlation id
+    :return: trace id
+    """
+    return secrets.token_hex(16)
+
+
+def new_span_id():
+    """
+    The function will create a span id, 8 random bytes in hex
+    :return: span id
+    """
+    return secrets.token_hex(8)
+
+
+def otlp_attributes(attributes):
+    """
+    The function will convert the attributes to the OTLP JSON key value list
+    :param attributes: dict of attributes
+    :return: OTLP attributes list
+    """
+    values = []
+    for key, value in attributes.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            values.append({'key': key, 'value': {'boolValue': value}})
+        elif isinstance(value, int):
+            values.append({'key': key, 'value': {'intValue': str(value)}})
+        elif isinstance(value, float):
+            values.append({'key': key, 'value': {'doubleValue': value}})
+        else:
+            values.append({'key': key, 'value': {'stringValue': str(value)}})
+    return values
+
+
+def export_span(service, name, trace_id, span_id, start_time, end_time, parent_span_id=None, attributes=None):
+    """
+    The function will append the span to the export file, one OTLP JSON export request per line.
+    The file can be loaded by an OpenTelemetry collector with the otlpjsonfile receiver.
+    :param service: service name, the pipeline stage app
+    :param name: span name
+    :param trace_id: trace id
+    :param span_id: span id
+    :param start_time: start time, epoch seconds
+    :param end_time: end time, epoch seconds
+    :param parent_span_id: optional, parent span id
+    :param attributes: optional, dict of span attributes
+    :return: None
+    """
+    if not tracing_enabled():
+        return
+    span = {'traceId': trace_id, 'spanId': span_id, 'name': name, 'kind': 1,
+            'startTimeUnixNano': str(int(start_time * 1e9)), 'endTimeUnixNano': str(int(end_time * 1e9)),
+            'attributes': otlp_attributes(attributes or {}), 'status': {}}
+    if parent_span_id:
+        span['parentSpanId'] = parent_span_id
+    request = {'resourceSpans': [{
+        'resource': {'attributes': otlp_attributes({'service.name': service})},
+        'scopeSpans': [{'scope': {'name': 'pipeline_tracing', 'version': __version__}, 'spans': [span]}]
+    }]}
+    with _export_lock:
+        with open(export_path(), 'a') as f:
+            f.write(json.dumps(request) + '\n')
+
+
+class Span:
+    """
+    Pipeline stage span, exported when it ends. It can be used as a context manager.
+    """
+
+    def __init__(self, service, name, trace_id=None, parent_span_id=None, attributes=None):
+        self.service = service
+        self.name = name
+        self.trace_id = trace_id or new_trace_id()
+        self.span_id = new_span_id()
+        self.parent_span_id = parent_span_id
+        self.attributes = dict(attributes or {})
+        self.start_time = time.time()
+        self.end_time = None
+
+    def end(self, **attributes):
+        """
+        The function will end the span and export it
+        :param attributes: optional, attributes added to the span
+        :return: None
+        """
+        self.attributes.update(attributes)
+        self.end_time = time.time()
+        export_span(self.service, self.name, self.trace_id, self.span_id, self.start_time, self.end_time,
+                    self.parent_span_id, self.attributes)
+
+    def child(self, name, **attributes):
+        """
+        The function will create a child span, in the same trace
+        :param name: span name
+        :param attributes: span attributes
+        :return: child span
+        """
+        return Span(self.service, name, self.trace_id, self.span_id, attributes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.attributes['error'] = repr(exc_value)
+        self.end()
+        return False
+
+
+def file_trace(span, issue_id):
+    """
+    The function will create the trace of a collected file, carried to the chunks metadata
+    :param span: collection span
+    :param issue_id: Assurance issue id
+    :return: trace dict
+    """
+    return {'trace_id': span.trace_id, 'trace_span_id': span.span_id, 'issue_id': issue_id,
+            'collected_at': time.time()}
+
+
+class TraceManifest:
+    """
+    The trace of each dataset file, saved by the collection app and read by the embeddings app:
+    trace id, collection span id, issue id and collection time
+    """
+
+    def __init__(self, folder):
+        self.path = os.path.join(folder, TRACE_MANIFEST)
+        self.files = {}
+        self._lock = threading.Lock()
+
+    def load(self):
+        """
+        The function will load the manifest, empty if the file does not exist
+        :return: the manifest
+        """
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                self.files = json.load(f)
+        return self
+
+    def record(self, filename, span, issue_id):
+        """
+        The function will record the collected file and save the manifest. The file is replaced
+        atomically, the embeddings app never reads a partial manifest.
+        :param filename: dataset filename
+        :param span: collection span
+        :param issue_id: Assurance issue id
+        :return: the file trace
+        """
+        with self._lock:
+            self.files[filename] = file_trace(span, issue_id)
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w') as f:
+                json.dump(self.files, f, indent=4)
+            os.replace(temp_path, self.path)
+            return self.files[filename]
+
+    def get(self, filename):
+        """
+        The function will return the trace of the dataset file
+        :param filename: dataset filename
+        :return: trace dict, or None for the files collected without tracing
+        """
+        return self.files.get(filename)
+
+
+def record_first_retrieval(docs, service='issues-pilot'):
+    """
+    The function will export a span the first time this process retrieves a chunk of each trace,
+    with the freshness, the seconds from the data collection to the retrieval
+    :param docs: retrieved documents
+    :param service: service name
+    :return: None
+    """
+    if not tracing_enabled():
+        return
+    now = time.time()
+    for doc in docs:
+        trace_id = doc.metadata.get('trace_id')
+        if not trace_id:
+            continue
+        with _export_lock:
+            if trace_id in _retrieved_traces:
+                continue
+            _retrieved_traces.add(trace_id)
+        collected_at = doc.metadata.get('collected_at')
+        export_span(service, 'first retrieved', trace_id, new_span_id(), now, now,
+                    parent_span_id=doc.metadata.get('trace_span_id'),
+                    attributes={'issue.id': doc.metadata.get('issue_id'), 'file.name': doc.metadata.get('source'),
+                                'freshness.seconds': round(now - collected_at, 3) if collected_at else None})
+
+
+def load_traces(path):
+    """
+    The function will load the exported spans, grouped by trace
+    :param path: spans export file
+    :return: dict trace id to spans list
+    """
+    traces = {}
+    with open(path, 'r') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            for resource_spans in json.loads(line)['resourceSpans']:
+                for scope_spans in resource_spans['scopeSpans']:
+                    for span in scope_spans['spans']:
+                        span['attributes'] = {item['key']: list(item['value'].values())[0]
+                                              for item in span['attributes']}
+                        traces.setdefault(span['traceId'], []).append(span)
+    return traces
+
+
+def stage_times(spans):
+    """
+    The function will calculate the pipeline stage times of the trace: collection done, last
+    file embedded and first retrieval
+    :param spans: trace spans
+    :return: dict stage to epoch seconds
+    """
+    stages = {}
+    for span in spans:
+        end_time = int(span['endTimeUnixNano']) / 1e9
+        if span['name'] == 'collect issue':
+            stages['issue id'] = span['attributes'].get('issue.id')
+            stages['start'] = int(span['startTimeUnixNano']) / 1e9
+            stages['collected'] = end_time
+        elif span['name'] == 'embed file':
+            stages['embedded'] = max(stages.get('embedded', 0.0), end_time)
+        elif span['name'] == 'first retrieved':
+            stages['retrieved'] = min(stages.get('retrieved', end_time), end_time)
+    return stages
+
+
+def main():
+    """
+    This app will report the pipeline latency for each traced issue, from the collection start to
+    the collection done, embedded and first retrieved stages, to find the freshness bottlenecks
+    """
+
+    # parse the input arguments
+    parser = argparse.ArgumentParser(description="IssuesPilot pipeline tracing report")
+    parser.add_argument("--file", default=export_path(), help="Spans export file")
+    args = parser.parse_args()
+
+    def seconds(stages, first, second):
+        if first in stages and second in stages:
+            return format(stages[second] - stages[first], '.1f') + ' s'
+        return '-'
+
+    for trace_id, spans in load_traces(args.file).items():
+        stages = stage_times(spans)
+        started = datetime.datetime.fromtimestamp(stages['start']).strftime('%c') if 'start' in stages else '-'
+        print('Issue ' + str(stages.get('issue id')) + ', trace ' + trace_id + ', started ' + started)
+        print('    collection ' + seconds(stages, 'start', 'collected') + ', embedding ' +
+              seconds(stages, 'collected', 'embedded') + ', first retrieval ' +
+              seconds(stages, 'embedded', 'retrieved') + ', end to end ' + seconds(stages, 'start', 'retrieved'))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,445 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu PTME"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import time
+
+from collections import Counter
+
+import chromadb
+from dotenv import load_dotenv
+
+# the BM25 index module is shared with the embeddings and client apps
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common'))
+
+from bm25_index import BM25Index  # noqa: E402
+
+load_dotenv('environment.env')
+
+os.environ['TZ'] = 'America/Los_Angeles'  # define the timezone for PST
+time.tzset()  # adjust the timezone, more info https://help.pythonanywhere.com/pages/SettingTheTimezone/
+
+# logging, info level
+logging.basicConfig(level=logging.INFO)
+logging.getLogger('httpx').setLevel(logging.WARNING)
+logging.getLogger('chromadb.telemetry').setLevel(logging.WARNING)
+
+DB_SERVER = os.getenv('DB_SERVER')
+DB_PORT = int(os.getenv('DB_PORT'))
+DB_COLLECTION = os.getenv('DB_COLLECTION')
+DB_PATH = os.getenv('DB_PATH')
+APPS_PATH = os.getenv('APPS_PATH')
+
+# metadata keys created by the embeddings app, reported as cardinalities
+METADATA_KEYS = ['device name', 'issue name', 'CLI command', 'source']
+
+# number of records read from, or written to, the collection in one request
+BATCH_SIZE = 500
+
+# the Chroma vector index folders are named by the segment id
+UUID_PATTERN = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+
+# volatile values masked before hashing, so re-collected outputs that only differ
+# by timestamps or ACL match counters are detected as near-duplicates
+VOLATILE_PATTERNS = [
+    re.compile(r'\d{1,2}:\d{2}:\d{2}(\.\d+)?'),
+    re.compile(r'\(\d+ match(es)?\)'),
+    re.compile(r'\b(mon|tue|wed|thu|fri|sat|sun) (jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec) +\d{1,2}\b'),
+]
+
+
+def get_all_records(collection, include_embeddings=False):
+    """
+    The function will read all the records from the collection, in batches
+    :param collection: Chroma collection
+    :param include_embeddings: include the embeddings in the response
+    :return: dict with the ids, documents, metadatas and, optional, embeddings lists
+    """
+    include = ['documents', 'metadatas']
+    if include_embeddings:
+        include.append('embeddings')
+    records = {'ids': [], 'documents': [], 'metadatas': [], 'embeddings': []}
+    offset = 0
+    while True:
+        batch = collection.get(include=include, limit=BATCH_SIZE, offset=offset)
+        if not batch['ids']:
+            break
+        records['ids'].extend(batch['ids'])
+        records['documents'].extend(batch['documents'])
+        records['metadatas'].extend(batch['metadatas'])
+        if include_embeddings:
+            records['embeddings'].extend([list(embedding) for embedding in batch['embeddings']])
+        offset += len(batch['ids'])
+    return records
+
+
+def folder_size(path):
+    """
+    The function will calculate the on-disk size of a folder
+    :param path: folder path
+    :return: size in bytes, or None if the folder is not local
+    """
+    if not path or not os.path.isdir(path):
+        return None
+    size = 0
+    for root, dirs, files in os.walk(path):
+        for file in files:
+            size += os.path.getsize(os.path.join(root, file))
+    return size
+
+
+def exact_hash(document, metadata):
+    """
+    The function will create the hash used to find exact duplicate chunks, same content and metadata
+    :param document: chunk content
+    :param metadata: chunk metadata
+    :return: sha256 hex digest
+    """
+    key = document + json.dumps(metadata or {}, sort_keys=True)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def near_hash(document, metadata):
+    """
+    The function will create the hash used to find near-duplicate chunks. The content is
+    lower case, with collapsed whitespace, and masked volatile values. The device name, issue
+    name, CLI command and source are part of the hash, the same output from two devices, or
+    collected for two issues, is not a duplicate, each issue dataset stays complete.
+    :param document: chunk content
+    :param metadata: chunk metadata
+    :return: sha256 hex digest
+    """
+    metadata = metadata or {}
+    text = ' '.join(document.lower().split())
+    for pattern in VOLATILE_PATTERNS:
+        text = pattern.sub('*', text)
+    key = '|'.join(str(metadata.get(key)) for key in ['device name', 'issue name', 'CLI command', 'source'])
+    key += '|' + text
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def find_duplicates(records):
+    """
+    The function will find the exact and near-duplicate chunks. The last ingested chunk is kept,
+    the older copies are reported as duplicates.
+    :param records: collection records
+    :return: exact duplicate ids list, near-duplicate ids list
+    """
+    exact_seen = {}
+    near_seen = {}
+    exact_ids = []
+    near_ids = []
+    # walk from the newest record, the first hash occurrence is the one kept
+    for record_id, document, metadata in reversed(list(zip(records['ids'], records['documents'],
+                                                           records['metadatas']))):
+        document = document or ''
+        exact_key = exact_hash(document, metadata)
+        if exact_key in exact_seen:
+            exact_ids.append(record_id)
+            continue
+        exact_seen[exact_key] = record_id
+        near_key = near_hash(document, metadata)
+        if near_key in near_seen:
+            near_ids.append(record_id)
+            continue
+        near_seen[near_key] = record_id
+    return exact_ids, near_ids
+
+
+def find_orphans(records):
+    """
+    The function will find the orphaned chunks, with missing metadata, or with a source file
+    no longer available in the {APPS_PATH} folder. The chunks streamed by the collection app
+    without saving the files have no source file.
+    :param records: collection records
+    :return: orphaned ids list
+    """
+    orphan_ids = []
+    for record_id, metadata in zip(records['ids'], records['metadatas']):
+        metadata = metadata or {}
+        source = metadata.get('source')
+        if not source or 'device name' not in metadata:
+            orphan_ids.append(record_id)
+        elif APPS_PATH and metadata.get('source saved', True) and not os.path.exists(os.path.join(APPS_PATH, source)):
+            orphan_ids.append(record_id)
+    return orphan_ids
+
+
+def collection_stats(collection, records):
+    """
+    The function will create the collection statistics
+    :param collection: Chroma collection
+    :param records: collection records
+    :return: dict with the statistics
+    """
+    stats = {'collection': collection.name,
+             'vector count': collection.count(),
+             'on-disk size bytes': folder_size(DB_PATH),
+             'cardinality': {},
+             'distribution': {}}
+    for key in METADATA_KEYS:
+        values = Counter(str((metadata or {}).get(key)) for metadata in records['metadatas'])
+        stats['cardinality'][key] = len(values)
+    # vectors distribution by device and issue
+    stats['distribution'] = dict(Counter(
+        str((metadata or {}).get('device name')) + ' / ' + str((metadata or {}).get('issue name'))
+        for metadata in records['metadatas']).most_common())
+    exact_ids, near_ids = find_duplicates(records)
+    stats['exact duplicates'] = len(exact_ids)
+    stats['near duplicates'] = len(near_ids)
+    stats['orphans'] = len(find_orphans(records))
+    return stats
+
+
+def get_ids(collection):
+    """
+    The function will read all the record ids from the collection, in batches
+    :param collection: Chroma collection
+    :return: ids list
+    """
+    ids = []
+    while True:
+        batch = collection.get(include=[], limit=BATCH_SIZE, offset=len(ids))
+        if not batch['ids']:
+            break
+        ids.extend(batch['ids'])
+    return ids
+
+
+def add_records(collection, records):
+    """
+    The function will upsert the records to the collection, in batches
+    :param collection: Chroma collection
+    :param records: records with the ids, embeddings, documents and metadatas
+    :return: None
+    """
+    for index in range(0, len(records['ids']), BATCH_SIZE):
+        collection.upsert(ids=records['ids'][index:index + BATCH_SIZE],
+                          embeddings=records['embeddings'][index:index + BATCH_SIZE],
+                          documents=records['documents'][index:index + BATCH_SIZE],
+                          metadatas=records['metadatas'][index:index + BATCH_SIZE])
+
+
+def copy_missing_records(source, target):
+    """
+    The function will copy the records missing from the target collection, the chunks ingested
+    in the source collection while it was copied
+    :param source: Chroma collection
+    :param target: Chroma collection
+    :return: number of records copied
+    """
+    target_ids = set(get_ids(target))
+    missing_ids = [record_id for record_id in get_ids(source) if record_id not in target_ids]
+    for index in range(0, len(missing_ids), BATCH_SIZE):
+        batch = source.get(ids=missing_ids[index:index + BATCH_SIZE],
+                           include=['embeddings', 'documents', 'metadatas'])
+        add_records(target, {'ids': batch['ids'], 'documents': batch['documents'], 'metadatas': batch['metadatas'],
+                             'embeddings': [list(embedding) for embedding in batch['embeddings']]})
+    return len(missing_ids)
+
+
+def rebuild_collection(chroma_client, collection):
+    """
+    The function will rebuild the collection index. Chroma does not reclaim the index space of
+    the deleted vectors, the records are copied to a new collection, {name}-compact, with the
+    same ids and embeddings, and the collections are renamed. The original collection serves
+    the queries and the ingest until it is replaced, and it is deleted after the records
+    ingested during the copy are copied. The client apps and the HTTP service resolve the
+    collection by name when its id changes.
+    :param chroma_client: Chroma client
+    :param collection: Chroma collection
+    :return: the rebuilt collection
+    """
+    name = collection.name
+    rebuild_name = name + '-compact'
+    replaced_name = name + '-compact-replaced'
+    collection_names = [item.name for item in chroma_client.list_collections()]
+    if replaced_name in collection_names:
+        raise RuntimeError('A previous rebuild did not complete, run the recover command first')
+
+    # a partial copy from a failed rebuild is discarded
+    if rebuild_name in collection_names:
+        chroma_client.delete_collection(name=rebuild_name)
+    rebuilt = chroma_client.create_collection(name=rebuild_name, metadata=collection.metadata,
+                                              configuration=collection.configuration)
+    try:
+        records = get_all_records(collection, include_embeddings=True)
+        add_records(rebuilt, records)
+        copy_missing_records(collection, rebuilt)
+    except Exception:
+        chroma_client.delete_collection(name=rebuild_name)
+        raise
+
+    # swap the names, the collection name is missing only between the two renames
+    collection.modify(name=replaced_name)
+    try:
+        rebuilt.modify(name=name)
+    except Exception:
+        collection.modify(name=name)
+        raise
+
+    # the chunks ingested in the original collection before it was renamed
+    copy_missing_records(collection, rebuilt)
+    chroma_client.delete_collection(name=replaced_name)
+    return rebuilt
+
+
+def remove_deleted_segments(path):
+    """
+    The function will remove the vector index folders of the deleted collections. Chroma keeps
+    the index folder of a deleted collection on disk, the folders not referenced by a segment in
+    the chroma.sqlite3 database are removed.
+    :param path: Chroma persistent folder, on the DB server
+    :return: number of bytes removed
+    """
+    database = os.path.join(path or '', 'chroma.sqlite3')
+    if not os.path.exists(database):
+        return 0
+    connection = sqlite3.connect('file:' + database + '?mode=ro', uri=True)
+    try:
+        segment_ids = {row[0] for row in connection.execute('SELECT id FROM segments')}
+    finally:
+        connection.close()
+    removed = 0
+    for folder in os.listdir(path):
+        folder_path = os.path.join(path, folder)
+        if os.path.isdir(folder_path) and UUID_PATTERN.fullmatch(folder) and folder not in segment_ids:
+            removed += folder_size(folder_path)
+            shutil.rmtree(folder_path)
+    return removed
+
+
+def recover_collection(chroma_client, name):
+    """
+    The function will recover the collection after a rebuild did not complete. The original
+    collection is renamed back if the rebuilt collection was not renamed, or else its records
+    missing from the rebuilt collection are copied and it is deleted.
+    :param chroma_client: Chroma client
+    :param name: collection name
+    :return: the collection
+    """
+    collection_names = [item.name for item in chroma_client.list_collections()]
+    if name + '-compact' in collection_names:
+        chroma_client.delete_collection(name=name + '-compact')
+    if name + '-compact-replaced' in collection_names:
+        replaced = chroma_client.get_collection(name=name + '-compact-replaced')
+        if name not in collection_names:
+            replaced.modify(name=name)
+        else:
+            copy_missing_records(replaced, chroma_client.get_collection(name=name))
+            chroma_client.delete_collection(name=name + '-compact-replaced')
+    return chroma_client.get_collection(name=name)
+
+
+def compact_collection(chroma_client, collection, remove_orphans=False, rebuild=True, dry_run=False):
+    """
+    The function will compact the collection, removing the duplicate, and optional orphaned,
+    chunks and rebuilding the index
+    :param chroma_client: Chroma client
+    :param collection: Chroma collection
+    :param remove_orphans: remove the orphaned chunks
+    :param rebuild: rebuild the collection index after removing the chunks
+    :param dry_run: report the chunks to be removed, without changing the collection
+    :return: number of chunks removed
+    """
+    records = get_all_records(collection)
+    exact_ids, near_ids = find_duplicates(records)
+    remove_ids = set(exact_ids + near_ids)
+    if remove_orphans:
+        remove_ids.update(find_orphans(records))
+    logging.info(' Chunks to be removed: ' + str(len(remove_ids)))
+    if dry_run:
+        return len(remove_ids)
+
+    remove_ids = list(remove_ids)
+    for index in range(0, len(remove_ids), BATCH_SIZE):
+        collection.delete(ids=remove_ids[index:index + BATCH_SIZE])
+
+    # keep the BM25 index in sync, the rebuilt collection keeps the same ids
+    bm25_index = BM25Index().load()
+    bm25_index.remove(remove_ids)
+    bm25_index.save()
+    if rebuild:
+        logging.info(' Rebuilding the collection index')
+        size_before = folder_size(DB_PATH)
+        collection = rebuild_collection(chroma_client, collection)
+        if size_before is not None:
+            logging.info(' Deleted collections index removed: ' + str(remove_deleted_segments(DB_PATH)) + ' bytes')
+        size_after = folder_size(DB_PATH)
+        if size_before is not None:
+            logging.info(' On-disk size before: ' + str(size_before) + ' bytes, after: ' + str(size_after) + ' bytes')
+    logging.info(' Collection count is ' + str(collection.count()))
+    return len(remove_ids)
+
+
+def main():
+    """
+    This app will report the collection statistics, the duplicate and orphaned chunks, and
+    compact the collection.
+    Commands: stats, duplicates, compact, recover (the collection after a rebuild did not complete)
+    """
+
+    parser = argparse.ArgumentParser(description='Chroma DB collection statistics and compaction')
+    parser.add_argument('command', choices=['stats', 'duplicates', 'compact', 'recover'], help='The command to run')
+    parser.add_argument('--orphans', action='store_true', help='Compact also removes the orphaned chunks')
+    parser.add_argument('--no-rebuild', action='store_true', help='Compact without rebuilding the index')
+    parser.add_argument('--dry-run', action='store_true', help='Report the chunks to be removed only')
+    args = parser.parse_args()
+
+    # configure the Chroma DB server
+    chroma_client = chromadb.HttpClient(host=DB_SERVER, port=DB_PORT)
+    chroma_client.heartbeat()
+    if args.command == 'recover':
+        collection = recover_collection(chroma_client, DB_COLLECTION)
+    else:
+        collection = chroma_client.get_collection(name=DB_COLLECTION)
+
+    if args.command == 'stats':
+        records = get_all_records(collection)
+        logging.info(' Collection statistics:\n' + json.dumps(collection_stats(collection, records), indent=4))
+    elif args.command == 'duplicates':
+        records = get_all_records(collection)
+        exact_ids, near_ids = find_duplicates(records)
+        orphan_ids = find_orphans(records)
+        logging.info(' Exact duplicates: ' + str(len(exact_ids)))
+        logging.info(' Near duplicates: ' + str(len(near_ids)))
+        logging.info(' Orphans: ' + str(len(orphan_ids)))
+    elif args.command == 'compact':
+        compact_collection(chroma_client, collection, remove_orphans=args.orphans, rebuild=not args.no_rebuild,
+                           dry_run=args.dry_run)
+    elif args.command == 'recover':
+        logging.info(' Collection recovered, collection count is ' + str(collection.count()))
+
+    # chromadb heartbeat
+    chroma_client.heartbeat()
+
+
+if __name__ == "__main__":
+    main()
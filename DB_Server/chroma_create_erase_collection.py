@@ -24,9 +24,15 @@ import logging
 import chromadb
 import time
 import os
+import sys
 
 from dotenv import load_dotenv
 
+# the BM25 index module is shared with the embeddings and client apps
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common'))
+
+from bm25_index import index_path  # noqa: E402
+
 
 load_dotenv('environment.env')
 
@@ -57,6 +63,9 @@ def main():
     if user_input == 'd':
         collection = chroma_client.delete_collection(name=DB_COLLECTION)
         logging.info(' Collection erased')
+        if os.path.exists(index_path()):
+            os.remove(index_path())
+            logging.info(' BM25 index erased')
     elif user_input == 'c':
         collection = chroma_client.get_or_create_collection(name=DB_COLLECTION)
         logging.info(' Collection existing or created')
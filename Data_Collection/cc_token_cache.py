@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import datetime
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from types import SimpleNamespace
+
+from catalystcentersdk import api
+from dotenv import load_dotenv
+
+load_dotenv('../environment.env')
+
+CC_URL = os.getenv('CC_URL')
+CC_USER = os.getenv('CC_USER')
+CC_PASS = os.getenv('CC_PASS')
+
+APPS_PATH = os.getenv('APPS_PATH')
+
+# the token cache file, shared by the collector processes, readable only by the owner
+CC_TOKEN_CACHE = os.getenv('CC_TOKEN_CACHE', os.path.join(APPS_PATH or '.', '.cc_token_cache.json'))
+
+# the Catalyst Center tokens are valid for 60 minutes, the cached token is refreshed before
+CC_TOKEN_TTL = int(os.getenv('CC_TOKEN_TTL', '3300'))
+
+# the authentication calls are kept for the auth calls per hour metric
+METRIC_WINDOW = 3600
+
+
+class TokenCache:
+    """
+    Catalyst Center token cache, saved to a local file with the expiry time. The file is locked
+    while a token is read or refreshed, the concurrent collector processes wait for the one
+    process authenticating and reuse its token.
+    """
+
+    def __init__(self, base_url=CC_URL, username=CC_USER, path=CC_TOKEN_CACHE, ttl=CC_TOKEN_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.key = hashlib.sha256((str(base_url) + '|' + str(username)).encode()).hexdigest()
+        self._lock = threading.Lock()
+
+    def _read(self):
+        """
+        The function will read the cache file, empty if the file does not exist
+        :return: cached tokens and auth calls
+        """
+        if not os.path.exists(self.path):
+            return {'tokens': {}, 'auth calls': []}
+        with open(self.path, 'r') as f:
+            return json.load(f)
+
+    def _write(self, data):
+        """
+        The function will replace the cache file atomically, readable only by the owner
+        :param data: cached tokens and auth calls
+        :return: None
+        """
+        temp_path = self.path + '.tmp'
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        os.replace(temp_path, self.path)
+
+    def get_token(self, authenticate, rejected_token=None):
+        """
+        The function will return the cached token, or authenticate and cache a new token if the
+        cached token expired or it was rejected by Catalyst Center
+        :param authenticate: function returning a new token
+        :param rejected_token: optional, the token rejected by Catalyst Center
+        :return: token
+        """
+        with self._lock, open(self.path + '.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                data = self._read()
+                entry = data['tokens'].get(self.key)
+                if entry and entry['expires'] > time.time() and entry['token'] != rejected_token:
+                    return entry['token']
+
+                # authenticate, the other processes wait for the lock and reuse the new token
+                token = authenticate()
+                now = time.time()
+                data['tokens'][self.key] = {'token': token, 'expires': now + self.ttl}
+                data['auth calls'] = [call for call in data['auth calls'] if now - call < METRIC_WINDOW] + [now]
+                self._write(data)
+                logging.info(' Catalyst Center authentication, token cached until ' +
+                             datetime.datetime.fromtimestamp(now + self.ttl).strftime('%H:%M:%S'))
+                return token
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def auth_calls_per_hour(self):
+        """
+        The function will count the authentication calls in the last hour, by all the processes
+        :return: number of authentication calls
+        """
+        now = time.time()
+        return len([call for call in self._read()['auth calls'] if now - call < METRIC_WINDOW])
+
+    def expires(self):
+        """
+        The function will return the cached token expiry time
+        :return: epoch seconds, or None if no token is cached
+        """
+        entry = self._read()['tokens'].get(self.key)
+        return entry['expires'] if entry else None
+
+
+class CachedAuthentication:
+    """
+    Wrapper of the SDK authentication API, the token is read from the token cache. The SDK
+    requests a new token when Catalyst Center rejects the current one, with HTTP 401, the
+    rejected token is replaced in the cache. The rejected token is the token sent by the
+    request of the calling thread, the collector threads rejected at the same time reuse the
+    token cached by the first one.
+    """
+
+    def __init__(self, authentication, cache, sent_token=None):
+        self.authentication = authentication
+        self.cache = cache
+        self.sent_token = sent_token
+
+    def authentication_api(self, username=None, password=None, encoded_auth=None, **kwargs):
+        def authenticate():
+            return self.authentication.authentication_api(username=username, password=password,
+                                                          encoded_auth=encoded_auth, **kwargs).Token
+
+        rejected_token = self.sent_token() if self.sent_token else None
+        token = self.cache.get_token(authenticate, rejected_token=rejected_token)
+        return SimpleNamespace(Token=token)
+
+    def __getattr__(self, name):
+        return getattr(self.authentication, name)
+
+
+class CachedTokenCatalystCenterAPI(api.CatalystCenterAPI):
+    """
+    Catalyst Center SDK client using the shared token cache, instead of authenticating for
+    each collector run
+    """
+
+    def __init__(self, *args, token_cache=None, **kwargs):
+        self._token_cache = token_cache or TokenCache(base_url=kwargs.get('base_url'), username=kwargs.get('username'))
+        self._sent_tokens = threading.local()
+        super().__init__(*args, **kwargs)
+
+        # the SDK session requests a new token from the thread of the rejected request, the token
+        # sent by each thread is recorded when the request starts, before another thread refreshes it
+        request = self._session.request
+
+        def token_recording_request(*request_args, **request_kwargs):
+            self._sent_tokens.token = self._session.access_token
+            return request(*request_args, **request_kwargs)
+
+        self._session.request = token_recording_request
+
+    @property
+    def authentication(self):
+        return self._cached_authentication
+
+    @authentication.setter
+    def authentication(self, value):
+        self._cached_authentication = CachedAuthentication(
+            value, self._token_cache, sent_token=lambda: getattr(self._sent_tokens, 'token', None))
+
+
+def main():
+    """
+    This app will report the token cache status and the auth calls per hour metric
+    """
+
+    # parse the input arguments
+    parser = argparse.ArgumentParser(description="Catalyst Center token cache status")
+    parser.add_argument("--json", action="store_true", help="Print the metrics as JSON")
+    args = parser.parse_args()
+
+    cache = TokenCache()
+    expires = cache.expires()
+    metrics = {'cc_auth_calls_per_hour': cache.auth_calls_per_hour(),
+               'cc_token_valid_seconds': max(0, int(expires - time.time())) if expires else 0}
+    if args.json:
+        print(json.dumps(metrics))
+    else:
+        print('Catalyst Center auth calls in the last hour: ' + str(metrics['cc_auth_calls_per_hour']))
+        print('Cached token valid for: ' + str(metrics['cc_token_valid_seconds']) + ' seconds')
+
+
+if __name__ == "__main__":
+    main()
@@ -29,15 +29,24 @@ import argparse
 import json
 import logging
 import os
+import sys
+import threading
 import time
 import urllib3
 import yaml
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from catalystcentersdk import api
 from dotenv import load_dotenv
 from urllib3.exceptions import InsecureRequestWarning  # for insecure https warnings
 
+# the pipeline tracing module is shared with the embeddings and client apps
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common'))
+
+from pipeline_tracing import Span, TraceManifest, file_trace  # noqa: E402
+
+from cc_token_cache import CachedTokenCatalystCenterAPI  # noqa: E402
+
 load_dotenv('../environment.env')
 
 CC_URL = os.getenv('CC_URL')
@@ -47,6 +56,9 @@ CC_PASS = os.getenv('CC_PASS')
 APPS_PATH = os.getenv('APPS_PATH')
 DATASET = os.getenv('DATASET')
 
+# maximum number of concurrent Catalyst Center requests, for the neighbors and commands fan-out
+COLLECTOR_WORKERS = int(os.getenv('COLLECTOR_WORKERS', '4'))
+
 os.environ['TZ'] = 'America/Los_Angeles'  # define the timezone for PST
 time.tzset()  # adjust the timezone, more info https://help.pythonanywhere.com/pages/SettingTheTimezone/
 
@@ -56,6 +68,157 @@ urllib3.disable_warnings(InsecureRequestWarning)  # disable insecure https warni
 logging.basicConfig(level=logging.INFO)
 
 
+class DatasetWriter:
+    """
+    Saves the collected data to the {DATASET} folder, and records the file trace. In streaming
+    mode each output is also handed off to the embeddings, the files are optional.
+    """
+
+    def __init__(self, manifest, trace, issue_id, stream=None, save_files=True):
+        self.manifest = manifest
+        self.trace = trace
+        self.issue_id = issue_id
+        self.stream = stream
+        self.save_files = save_files
+
+    def save(self, filename, data):
+        """
+        The function will save the collected data, and queue it to the embedding stream
+        :param filename: dataset filename, with the device, issue and command
+        :param data: collected data
+        :return: None
+        """
+        if self.save_files:
+            with open(APPS_PATH + '/' + DATASET + '/' + filename, 'w') as f:
+                f.write(data)
+            file_trace_data = self.manifest.record(filename, self.trace, self.issue_id)
+        else:
+            file_trace_data = file_trace(self.trace, self.issue_id)
+        if self.stream is not None:
+            self.stream.submit(filename, data, file_trace_data)
+
+
+def get_topology_nodes(cc_api, device_id):
+    """
+    The function will retrieve the device physical topology nodes
+    :param cc_api: Catalyst Center API
+    :param device_id: device uuid
+    :return: list of topology nodes
+    """
+    headers = {'entity_type': 'device_id', 'entity_value': device_id}
+    topology_response = cc_api.devices.get_device_enrichment_details(headers=headers)
+    return topology_response[0]['deviceDetails']['neighborTopology'][0]['nodes']
+
+
+def neighbor_topology_nodes(cc_api, device):
+    """
+    The function will retrieve the neighbor device topology nodes, for the next hop. A neighbor
+    without topology data, or an API error, does not stop the collection.
+    :param cc_api: Catalyst Center API
+    :param device: neighbor device dict
+    :return: list of topology nodes, empty if not available
+    """
+    try:
+        return get_topology_nodes(cc_api, device['id'])
+    except Exception as error:
+        logging.info(' Neighbor ' + device['hostname'] + ' topology not available: ' + str(error))
+        return []
+
+
+def resolve_device(cc_api, node):
+    """
+    The function will resolve the topology node to a reachable managed device, by IP address or
+    by hostname
+    :param cc_api: Catalyst Center API
+    :param node: topology node
+    :return: device dict with id, hostname and IP address, or None if not managed or not reachable
+    """
+    try:
+        devices = []
+        if node.get('ip'):
+            devices = cc_api.devices.get_device_list(management_ip_address=node['ip'])['response']
+        if not devices and node.get('name'):
+            devices = cc_api.devices.get_device_list(hostname=node['name'])['response']
+    except Exception as error:
+        logging.info(' Neighbor ' + str(node.get('name')) + ' not resolved: ' + str(error))
+        return None
+    if not devices or devices[0].get('reachabilityStatus') != 'Reachable':
+        return None
+    return {'id': devices[0]['id'], 'hostname': devices[0]['hostname'], 'ip': devices[0]['managementIpAddress']}
+
+
+def discover_neighbors(cc_api, device_id, topology_nodes, hops, executor):
+    """
+    The function will discover the managed neighbor devices, up to {hops} away from the device.
+    Each hop is resolved concurrently, the devices reached through several paths are collected once.
+    :param cc_api: Catalyst Center API
+    :param device_id: the issue device uuid
+    :param topology_nodes: the issue device topology nodes
+    :param hops: number of hops
+    :param executor: thread pool, bounded number of workers
+    :return: list of neighbor devices, with the hop count
+    """
+    visited = {device_id}
+    neighbors = []
+    nodes = topology_nodes
+    for hop in range(1, hops + 1):
+        # the same node may be connected with several devices of the previous hop
+        unique_nodes = list({str(node.get('ip') or node.get('name')): node for node in nodes}.values())
+        level = []
+        for device in executor.map(lambda node: resolve_device(cc_api, node), unique_nodes):
+            if device is None or device['id'] in visited:
+                continue
+            visited.add(device['id'])
+            level.append(device)
+            neighbors.append(dict(device, hop=hop))
+        if hop == hops or not level:
+            break
+        nodes = [node for device_nodes in executor.map(lambda device: neighbor_topology_nodes(cc_api, device), level)
+                 for node in device_nodes]
+    return neighbors
+
+
+def run_command(cc_api, device_ids, command):
+    """
+    The function will run the read only command on the devices with the Command Runner, and
+    retrieve the command output of each device
+    :param cc_api: Catalyst Center API
+    :param device_ids: list of device uuids
+    :param command: CLI command
+    :return: dict device uuid to command output
+    """
+    command_runner_response = cc_api.command_runner.run_read_only_commands_on_devices_to_get_their_real_time_configuration(deviceUuids=device_ids, commands=[command])
+    task_id = command_runner_response['response']['taskId']
+    logging.info(' Task Id: ' + task_id + ', command: ' + command)
+
+    # check for task to complete
+    end_time = ''
+    time.sleep(1)
+    while end_time == '':
+        task_status_response = cc_api.task.get_task_by_id(task_id=task_id)['response']
+        end_time = task_status_response.get('endTime', '')
+        if end_time == '':
+            time.sleep(1)
+    time.sleep(5)
+
+    file_info = task_status_response['progress']
+
+    file_info_json = json.loads(file_info)
+    file_id = file_info_json['fileId']
+    logging.info(' Commands output file Id: ' + file_id + '\n')
+
+    # retrieve the commands output from file, one entry for each device
+    file_content = cc_api.file.download_a_file_by_fileid(file_id=file_id).data
+    file_content_data = file_content.decode('ASCII')
+    file_content_json = json.loads(file_content_data)
+    outputs = {}
+    for device_response in file_content_json:
+        command_responses_success = device_response['commandResponses']['SUCCESS']
+        outputs[device_response['deviceUuid']] = ''.join('\n    ' + command_responses_success[key]
+                                                         for key in command_responses_success)
+    return outputs
+
+
 def main():
     """
     This application will automate network troubleshooting of network devices using Catalyst Center APIs. It will
@@ -69,6 +232,8 @@ def main():
     - execute Assurance suggested actions
     - identify the type of issue
     - execute all commands from troubleshooting knowledge base that match the the issue type
+    - optional, with --hops, execute the knowledge base neighbor commands on the managed neighbor devices
+    The Command Runner tasks run concurrently, with a bounded number of workers.
     :return:
     """
 
@@ -81,17 +246,44 @@ def main():
     # parse the input arguments
     parser = argparse.ArgumentParser(description="A script that accepts one argument")
     parser.add_argument("assuranceIssueId", help="The Assurance issue Id")
+    parser.add_argument("--hops", type=int, default=0,
+                        help="Collect the neighbor devices up to this number of hops, default 0, the issue device only")
+    parser.add_argument("--workers", type=int, default=COLLECTOR_WORKERS,
+                        help="Maximum number of concurrent Catalyst Center requests")
+    parser.add_argument("--stream", action="store_true",
+                        help="Embed each output as soon as it is collected, without the embeddings app")
+    parser.add_argument("--no-files", action="store_true",
+                        help="With --stream, do not save the outputs to the DATASET folder")
 
     args = parser.parse_args()
     issue_id = args.assuranceIssueId
+    if args.no_files and not args.stream:
+        parser.error('--no-files requires --stream')
 
     logging.info(' The Assurance issue Id received is: ' + issue_id)
 
     os.chdir(APPS_PATH + '/' + DATASET)
 
-    # create a Catalyst Center connection object to use the Python SDK
-    cc_api = api.CatalystCenterAPI(username=CC_USER, password=CC_PASS,
-                                       base_url=CC_URL, version='2.3.7.9', verify=False)
+    # start the pipeline trace, the trace id is saved with each dataset file and carried to the chunks
+    trace = Span('network-troubleshooting', 'collect issue', attributes={'issue.id': issue_id})
+    manifest = TraceManifest(APPS_PATH + '/' + DATASET).load()
+    logging.info(' The pipeline trace Id is: ' + trace.trace_id)
+
+    # streaming mode, the embeddings model loads while the data is collected
+    stream = None
+    if args.stream:
+        sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Transform_Data'))
+        from embedding_stream import EmbeddingStream
+        stream = EmbeddingStream(source_saved=not args.no_files)
+        logging.info(' Streaming the collected data to the embeddings')
+    writer = DatasetWriter(manifest, trace, issue_id, stream=stream, save_files=not args.no_files)
+
+    # create a Catalyst Center connection object to use the Python SDK, the auth token is shared
+    # with the other collector processes, and refreshed when it expires or it is rejected
+    cc_api = CachedTokenCatalystCenterAPI(username=CC_USER, password=CC_PASS,
+                                          base_url=CC_URL, version='2.3.7.9', verify=False)
+    auth_calls = cc_api.authentication.cache.auth_calls_per_hour()
+    logging.info(' Catalyst Center auth calls in the last hour: ' + str(auth_calls))
 
     # retrieve the issue enrichment details
     headers = {'entity_type': 'issue_id', 'entity_value': issue_id}
@@ -146,10 +338,8 @@ def main():
     logging.info(device_details_data)
 
     # save to issue and device details to DATASET folder
-    with open(device_hostname + '_' + issue_name + '_issue-details.txt', 'w') as f:
-        f.write(issue_details_data)
-    with open(device_hostname + '_' + issue_name + '_device-details.txt', 'w') as f:
-        f.write(device_details_data)
+    writer.save(device_hostname + '_' + issue_name + '_issue-details.txt', issue_details_data)
+    writer.save(device_hostname + '_' + issue_name + '_device-details.txt', device_details_data)
 
     # retrieve device compliance
     logging.info('\n--------------------------------------------------------------------\n')
@@ -162,111 +352,139 @@ def main():
     logging.info(compliance_status_data)
 
     # save to compliance to DATASET folder
-    with open(APPS_PATH + '/DATASET/' + device_hostname + '_' + issue_name + '_compliance.txt', 'w') as f:
-        f.write(compliance_status_data)
+    writer.save(device_hostname + '_' + issue_name + '_compliance.txt', compliance_status_data)
 
     # retrieve the device topology
     logging.info('\n--------------------------------------------------------------------\n')
     logging.info(' Device topology data started')
-    headers = {'entity_type': 'device_id', 'entity_value': device_id}
-    topology_response = cc_api.devices.get_device_enrichment_details(headers=headers)
-    topology_data = topology_response[0]['deviceDetails']['neighborTopology'][0]['nodes']
+    topology_data = get_topology_nodes(cc_api, device_id)
     topology_nodes = []
     for node in topology_data:
         topology_nodes.append(device_hostname + ' connected with ' + node['name'] + ', IP address: ' + node['ip'])
-    # save device topology to JSON formatted file
-    with open(APPS_PATH + '/DATASET/' + device_hostname + '_' + issue_name + '_topology.txt', 'w') as f:
-        f.write('This is the device ' + device_hostname + ' topology, connected with other devices and their IP address\n')
-        f.write('\n'.join(topology_nodes) + '\n') # write each node on one line
+    # save device topology to the DATASET folder, each node on one line
+    topology_file_data = 'This is the device ' + device_hostname + ' topology, connected with other devices and their IP address\n'
+    topology_file_data += '\n'.join(topology_nodes) + '\n'
+    writer.save(device_hostname + '_' + issue_name + '_topology.txt', topology_file_data)
     logging.info(topology_nodes)
     logging.info(' Saved the device topology')
 
-    # execute suggested actions
-    suggested_actions_response = cc_api.issues.execute_suggested_actions_commands(entity_type='issue_id', entity_value=issue_id)
-    execution_id = suggested_actions_response['executionId']
-
-    # check for execution to complete
-    logging.info('\n--------------------------------------------------------------------\n')
-    logging.info(' Suggested actions execution started')
-    execution_status = 'IN_PROGRESS'
-    suggested_actions_data = 'The device: ' + device_hostname + ' Suggested actions'
-    time.sleep(10)
-    while execution_status == 'IN_PROGRESS':
-        execution_status_response = cc_api.task.get_business_api_execution_details(execution_id=execution_id)
-        execution_status = execution_status_response['status']
-        time.sleep(10)
-
-    if execution_status != 'SUCCESS':
-        logging.info(' Suggested actions execution failed')
-    else:
-        logging.info(' Suggested actions execution completed')
-        suggested_actions_output = execution_status_response['bapiSyncResponse']
-        status_json = json.loads(suggested_actions_output)
-
-        # logging suggested actions executions
-        for item in status_json:
-            suggested_actions_data += '\n!'
-            suggested_actions_data += '\n   ' + item['actionInfo']
-            suggested_actions_data += '\n   Device: ' + item['hostname']
-            suggested_actions_data += '\n   Command: ' + item['command']
-            command_output = item['commandOutput']
-            output = command_output[item['command']]
-            suggested_actions_data += '\n   Command output: \n' + output
-        logging.info(suggested_actions_data)
-        # save to suggested actions execution data to DATASET folder
-        with open(APPS_PATH + '/DATASET/' + device_hostname + '_' + issue_name + '_suggested-actions.txt', 'w') as f:
-            f.write(suggested_actions_data)
-
-    # knowledge base pull CLI commands and execution
-    logging.info('\n--------------------------------------------------------------------\n')
-    with open('../Data_Collection/troubleshooting_knowledgebase.yml', 'r') as file:
-        knowledgebase = yaml.safe_load(file)
-
-    # parse the input data
-    cli_commands = knowledgebase[issue_name]['commands']
-    logging.info(' Knowledgebase CLI commands:')
-    for command in cli_commands:
-        logging.info('    ' + command)
-    logging.info('  ')
-
-    # execute knowledge base commands, one at a time
-    logging.info(' Knowledgebase commands execution started')
-    for command in cli_commands:
-        command_runner_response = cc_api.command_runner.run_read_only_commands_on_devices_to_get_their_real_time_configuration(deviceUuids=[device_id], commands=[command])
-        task_id = command_runner_response['response']['taskId']
-        logging.info(' Task Id: ' + task_id)
-
-        # check for task to complete
-        end_time = ''
-        time.sleep(1)
-        while end_time == '':
-            task_status_response = cc_api.task.get_task_by_id(task_id=task_id)['response']
-            end_time = task_status_response['endTime']
-        time.sleep(5)
-
-        file_info = task_status_response['progress']
-
-        file_info_json = json.loads(file_info)
-        file_id = file_info_json['fileId']
-        logging.info(' Commands output file Id: ' + file_id + '\n')
-
-        # retrieve the commands output from file
-        logging.info(' Knowledgebase CLI commands output:')
-        file_content = cc_api.file.download_a_file_by_fileid(file_id=file_id).data
-        file_content_data = file_content.decode('ASCII')
-        file_content_json = json.loads(file_content_data)
-        command_responses_success = file_content_json[0]['commandResponses']['SUCCESS']
-        command_response_data = 'The device: ' + device_hostname + ' command: ' + command
-        for key in command_responses_success:
-            command_response_data += '\n    ' + command_responses_success[key]
-        logging.info(command_response_data)
-
-        # save to command runner output data to DATASET folder
-        with open(APPS_PATH + '/DATASET/' + device_hostname + '_' + issue_name + '_' + command.replace(' ', '-'), 'w') as f:
-            f.write(command_response_data)
+    # the Command Runner tasks and the neighbors discovery share the bounded thread pool
+    executor = ThreadPoolExecutor(max_workers=args.workers)
+    neighbors = []
+    suggested_actions_thread = None
+    stream_stats = None
+    try:
+        # discover the managed neighbor devices, up to {hops} away
+        if args.hops > 0:
+            logging.info('\n--------------------------------------------------------------------\n')
+            neighbors_span = trace.child('discover neighbors', hops=args.hops)
+            neighbors = discover_neighbors(cc_api, device_id, topology_data, args.hops, executor)
+            neighbors_span.end(**{'devices.count': len(neighbors)})
+            neighbor_devices_data = 'The device: ' + device_hostname + ' neighbor devices, up to ' + str(args.hops) + ' hops'
+            for neighbor in neighbors:
+                neighbor_devices_data += '\n   ' + neighbor['hostname'] + ', hop ' + str(neighbor['hop']) + ', IP address: ' + neighbor['ip']
+            logging.info(neighbor_devices_data)
+            writer.save(device_hostname + '_' + issue_name + '_neighbor-devices.txt', neighbor_devices_data)
+
+        # execute suggested actions
+        suggested_actions_span = trace.child('suggested actions')
+        suggested_actions_response = cc_api.issues.execute_suggested_actions_commands(entity_type='issue_id', entity_value=issue_id)
+        execution_id = suggested_actions_response['executionId']
+
+        # check for execution to complete, in the background while the knowledge base commands run
+        def collect_suggested_actions():
+            logging.info(' Suggested actions execution started')
+            execution_status = 'IN_PROGRESS'
+            suggested_actions_data = 'The device: ' + device_hostname + ' Suggested actions'
+            time.sleep(10)
+            while execution_status == 'IN_PROGRESS':
+                execution_status_response = cc_api.task.get_business_api_execution_details(execution_id=execution_id)
+                execution_status = execution_status_response['status']
+                time.sleep(10)
+
+            if execution_status != 'SUCCESS':
+                logging.info(' Suggested actions execution failed')
+            else:
+                logging.info(' Suggested actions execution completed')
+                suggested_actions_output = execution_status_response['bapiSyncResponse']
+                status_json = json.loads(suggested_actions_output)
+
+                # logging suggested actions executions
+                for item in status_json:
+                    suggested_actions_data += '\n!'
+                    suggested_actions_data += '\n   ' + item['actionInfo']
+                    suggested_actions_data += '\n   Device: ' + item['hostname']
+                    suggested_actions_data += '\n   Command: ' + item['command']
+                    command_output = item['commandOutput']
+                    output = command_output[item['command']]
+                    suggested_actions_data += '\n   Command output: \n' + output
+                logging.info(suggested_actions_data)
+                # save to suggested actions execution data to DATASET folder
+                writer.save(device_hostname + '_' + issue_name + '_suggested-actions.txt', suggested_actions_data)
+            suggested_actions_span.end(status=execution_status)
+
+        suggested_actions_thread = threading.Thread(target=collect_suggested_actions, name='suggested-actions')
+        suggested_actions_thread.start()
+
+        # knowledge base pull CLI commands and execution
+        logging.info('\n--------------------------------------------------------------------\n')
+        with open('../Data_Collection/troubleshooting_knowledgebase.yml', 'r') as file:
+            knowledgebase = yaml.safe_load(file)
+
+        # parse the input data, the neighbor devices run the neighbor commands, default all the commands
+        cli_commands = knowledgebase[issue_name]['commands']
+        neighbor_commands = knowledgebase[issue_name].get('neighbor_commands', cli_commands)
+        logging.info(' Knowledgebase CLI commands:')
+        for command in cli_commands:
+            logging.info('    ' + command)
+        logging.info('  ')
+
+        # the issue device and the neighbor devices
+        hostnames = {device_id: device_hostname}
+        hostnames.update({neighbor['id']: neighbor['hostname'] for neighbor in neighbors})
+
+        def collect_command(command):
+            # each command runs on all the devices in one Command Runner task
+            device_ids = [device_id] if command in cli_commands else []
+            if command in neighbor_commands:
+                device_ids += [neighbor['id'] for neighbor in neighbors]
+            command_span = trace.child('run command', command=command, **{'devices.count': len(device_ids)})
+            outputs = run_command(cc_api, device_ids, command)
+            for output_device_id, output in outputs.items():
+                command_response_data = 'The device: ' + hostnames[output_device_id] + ' command: ' + command + output
+                logging.info(command_response_data)
+
+                # save to command runner output data to DATASET folder, in the same issue dataset
+                writer.save(hostnames[output_device_id] + '_' + issue_name + '_' + command.replace(' ', '-'),
+                            command_response_data)
+            command_span.end()
+
+        # execute knowledge base commands, concurrently
+        logging.info(' Knowledgebase commands execution started')
+        commands = cli_commands + [command for command in neighbor_commands if neighbors and command not in cli_commands]
+        list(executor.map(collect_command, commands))
+    finally:
+        # the suggested actions and the streamed outputs are completed also when a command fails
+        executor.shutdown()
+        if suggested_actions_thread is not None:
+            suggested_actions_thread.join()
+        if stream is not None:
+            stream_stats = stream.close()
 
     logging.info(' Knowledgebase commands execution completed')
 
+    # the streamed outputs were embedded before the stream was closed
+    if stream is not None:
+        logging.info(' Streamed ' + str(stream_stats['outputs']) + ' outputs, ' + str(stream_stats['chunks']) +
+                     ' chunks, retrievable after median ' + str(stream_stats['median seconds']) + ' seconds, max ' +
+                     str(stream_stats['max seconds']) + ' seconds')
+        if stream.error is not None:
+            logging.info(' Embedding stream error: ' + str(stream.error))
+
+    # end the collection span, the embeddings app continues the trace
+    trace.end(**{'device.name': device_hostname, 'issue.name': issue_name, 'cc.auth_calls_per_hour': auth_calls,
+                 'devices.count': 1 + len(neighbors)})
+
     current_time = str(datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
     logging.info(' App "Network Troubleshooting.py" run end, ' + current_time)
 
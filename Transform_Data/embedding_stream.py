@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import logging
+import os
+import queue
+import threading
+import time
+
+import chromadb
+from langchain_core.documents import Document
+from langchain_huggingface import HuggingFaceEmbeddings
+
+from embeddings_to_chroma import (DATASET, DB_COLLECTION, DB_PORT, DB_SERVER, MODEL_NAME, BM25Index, Span,
+                                  create_doc_embeddings)
+
+# the BM25 index is saved at most once per interval seconds while the outputs are streamed, and when the stream is closed
+EMBEDDING_STREAM_SAVE_INTERVAL = float(os.getenv('EMBEDDING_STREAM_SAVE_INTERVAL', '2'))
+
+
+class EmbeddingStream:
+    """
+    In-process hand-off from the collection app to the embeddings. Each collected output is
+    queued, and a worker thread chunks, embeds and upserts it to the Chroma collection and the
+    BM25 index, the data is retrievable by the client apps seconds after it is collected.
+    The embeddings model is loaded by the worker, while the collection starts.
+    """
+
+    def __init__(self, collection_name=DB_COLLECTION, source_saved=True):
+        self.collection_name = collection_name
+        self.source_saved = source_saved
+        self.queue = queue.Queue()
+        self.latencies = []
+        self.chunks = 0
+        self.error = None
+        self.worker = threading.Thread(target=self.run, name='embedding-stream', daemon=True)
+        self.worker.start()
+
+    def submit(self, filename, data, trace=None):
+        """
+        The function will queue the collected output to be embedded
+        :param filename: dataset filename, with the device, issue and command
+        :param data: collected output
+        :param trace: optional, the file trace, carried to the chunks metadata
+        :return: None
+        """
+        self.queue.put((filename, data, trace, time.time()))
+
+    def run(self):
+        """
+        The function will embed the queued outputs, until the stream is closed
+        :return: None
+        """
+        try:
+            chroma_db_server = chromadb.HttpClient(host=DB_SERVER, port=DB_PORT)
+            embeddings = HuggingFaceEmbeddings(model_name=MODEL_NAME)
+            index = BM25Index().load()
+        except Exception as error:
+            self.error = error
+            logging.info(' Embedding stream failed to start: ' + str(error))
+            return
+
+        # the outputs embedded since the last BM25 index save, retrievable after the save
+        embedded = []
+        last_save = 0.0
+        while True:
+            try:
+                timeout = max(0.0, last_save + EMBEDDING_STREAM_SAVE_INTERVAL - time.time()) if embedded else None
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = False
+            if item:
+                self.embed(item, index, embeddings, chroma_db_server, embedded)
+
+            # the BM25 index file is rewritten when the interval elapsed, or the stream is closed, not for each output
+            if embedded and (item is None or time.time() - last_save >= EMBEDDING_STREAM_SAVE_INTERVAL):
+                self.save(index, embedded)
+                last_save = time.time()
+            if item is None:
+                break
+
+    def embed(self, item, index, embeddings, chroma_db_server, embedded):
+        """
+        The function will chunk, embed and upsert the queued output to the Chroma collection and
+        the BM25 index, the index is saved by the worker
+        :param item: queued output, filename, data, trace and submit time
+        :param index: BM25 index
+        :param embeddings: embeddings model
+        :param chroma_db_server: Chroma client
+        :param embedded: list of the outputs embedded since the last save, the output is added
+        :return: None
+        """
+        filename, data, trace, submitted = item
+        span = None
+        if trace is not None:
+            span = Span('embeddings-to-chroma', 'embed file', trace['trace_id'], trace['trace_span_id'],
+                        {'file.name': filename, 'issue.id': trace['issue_id'], 'streamed': True})
+
+        # the same metadata as the files loaded from the {DATASET} folder
+        metadata = {'source': DATASET + '/' + filename}
+        if not self.source_saved:
+            metadata['source saved'] = False
+        document = [Document(page_content=data, metadata=metadata)]
+        count_before = len(index.docs)
+        try:
+            create_doc_embeddings(document=document, file=filename.split(".")[0], index=index,
+                                  embeddings=embeddings, chroma_db_server=chroma_db_server,
+                                  collection_name=self.collection_name, trace=trace)
+        except Exception as error:
+            self.error = error
+            logging.info(' Embedding stream failed for ' + filename + ': ' + str(error))
+            return
+        self.chunks += len(index.docs) - count_before
+        embedded.append((filename, trace, submitted, span))
+
+    def save(self, index, embedded):
+        """
+        The function will save the BM25 index, the client apps reload it when the file changes,
+        and record the latency of the embedded outputs
+        :param index: BM25 index
+        :param embedded: list of the outputs embedded since the last save, cleared when saved
+        :return: None
+        """
+        try:
+            index.save()
+        except Exception as error:
+            # the changes are kept in the index, saved with the next outputs
+            self.error = error
+            logging.info(' Embedding stream failed to save the BM25 index: ' + str(error))
+            return
+        for filename, trace, submitted, span in embedded:
+            latency = time.time() - submitted
+            self.latencies.append(latency)
+            logging.info(' Streamed ' + filename + ', retrievable ' + format(latency, '.1f') +
+                         ' seconds after it was collected')
+            if span is not None:
+                span.end(**{'freshness.seconds': round(time.time() - trace['collected_at'], 3)})
+        embedded.clear()
+
+    def close(self):
+        """
+        The function will wait for the queued outputs to be embedded, and stop the worker
+        :return: dict with the streamed outputs, chunks and latency statistics
+        """
+        self.queue.put(None)
+        self.worker.join()
+        latencies = sorted(self.latencies)
+        return {'outputs': len(latencies), 'chunks': self.chunks,
+                'median seconds': round(latencies[len(latencies) // 2], 2) if latencies else 0.0,
+                'max seconds': round(latencies[-1], 2) if latencies else 0.0}
@@ -22,7 +22,9 @@ __license__ = "Cisco Sample Code License, Version 1.1"
 
 import logging
 import os
+import sys
 import time
+import uuid
 
 import chromadb
 from dotenv import load_dotenv
@@ -32,6 +34,12 @@ from langchain_chroma import Chroma
 from langchain_community.document_loaders import DirectoryLoader, TextLoader
 from langchain_huggingface import HuggingFaceEmbeddings
 
+# the BM25 index and pipeline tracing modules are shared with the client apps
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common'))
+
+from bm25_index import BM25Index  # noqa: E402
+from pipeline_tracing import TRACE_METADATA, Span, TraceManifest  # noqa: E402
+
 os.environ['TZ'] = 'America/Los_Angeles'  # define the timezone for PST
 time.tzset()  # adjust the timezone, more info https://help.pythonanywhere.com/pages/SettingTheTimezone/
 
@@ -66,16 +74,17 @@ def load_docs(directory):
     return documents
 
 
-def split_docs(document, chunk_size, chunk_overlap, separator, file):
+def split_docs(document, chunk_size, chunk_overlap, separator, file, trace=None):
     """
     This function will split the documents with the defined number of characters, overlap,
     and separator. It will add metadata to each chunk. The metadata will be created based
-    on the filename.
+    on the filename, and the pipeline trace of the file.
     :param document: document to be split
     :param chunk_size: chuck size
     :param chunk_overlap: overlap
     :param separator: separator
     :param file: filename for the content
+    :param trace: optional, the file trace from the collection app manifest
     :return: doc split in chunks
     """
 
@@ -97,6 +106,9 @@ def split_docs(document, chunk_size, chunk_overlap, separator, file):
         doc.metadata['device name'] = device_name
         doc.metadata['issue name'] = issue_name
         doc.metadata['CLI command'] = command
+        if trace is not None:
+            for key in TRACE_METADATA:
+                doc.metadata[key] = trace[key]
         chunk_number += 1
 
     return split_documents
@@ -115,37 +127,52 @@ def load_file(filename, path):
 
 
 # noinspection PyProtectedMember,PyUnusedLocal
-def create_doc_embeddings(document, file):
+def create_doc_embeddings(document, file, index=None, embeddings=None, chroma_db_server=None,
+                          collection_name=DB_COLLECTION, trace=None):
     """
     The function will create the embeddings for the {doc}, with the metadata provided, using
     {sentence-transformers/all-MiniLM-L6-v2} model.
-    Update the ChromaDB vector database with the new embeddings
+    Update the ChromaDB vector database with the new embeddings, and the BM25 index with the
+    chunks, using the same ids
     :param document: document to be embedded
     :param file: filename for the document
+    :param index: optional, BM25 index to be updated
+    :param embeddings: optional, embeddings model, reused across files
+    :param chroma_db_server: optional, Chroma client, reused across files
+    :param collection_name: collection to be updated
+    :param trace: optional, the file trace, carried to the chunks metadata
     :return: collection count, after updating it
     """
 
     # connection to the Chroma DB server
-    chroma_db_server = chromadb.HttpClient(host=DB_SERVER, port=DB_PORT)
+    if chroma_db_server is None:
+        chroma_db_server = chromadb.HttpClient(host=DB_SERVER, port=DB_PORT)
 
     # split the document, create embeddings
-    docs = split_docs(document=document, chunk_size=100, chunk_overlap=25, separator="!", file=file)
+    docs = split_docs(document=document, chunk_size=100, chunk_overlap=25, separator="!", file=file, trace=trace)
 
     # define embeddings model
-    embeddings = HuggingFaceEmbeddings(model_name=MODEL_NAME)
+    if embeddings is None:
+        embeddings = HuggingFaceEmbeddings(model_name=MODEL_NAME)
 
     # update the chroma db collection with the new embeddings
+    ids = [str(uuid.uuid4()) for doc in docs]
     chroma_db = Chroma.from_documents(
         documents=docs,
         embedding=embeddings,
+        ids=ids,
         client=chroma_db_server,
-        collection_name=DB_COLLECTION
+        collection_name=collection_name
         )
 
+    # update the lexical index with the same chunks
+    if index is not None:
+        index.add(ids, [doc.page_content for doc in docs], [doc.metadata for doc in docs])
+
     # get the updated collection count
     chroma_collection = Chroma(
         client=chroma_db_server,
-        collection_name=DB_COLLECTION
+        collection_name=collection_name
     )
     return chroma_collection._collection.count()
 
@@ -170,17 +197,40 @@ def main():
     # chromadb heartbeat
     chroma_db.heartbeat()
 
-    # load the files from the folder
-    files_list = os.listdir(DATASET)
+    # load the BM25 index, remove the chunks no longer in the collection
+    index = BM25Index().load()
+    collection = chroma_db.get_or_create_collection(name=DB_COLLECTION)
+    removed = index.sync(collection.get(include=[])['ids'])
+    logging.info(' BM25 index loaded, stale chunks removed: ' + str(removed))
+
+    # define embeddings model, loaded once for all the files
+    embeddings = HuggingFaceEmbeddings(model_name=MODEL_NAME)
+
+    # load the pipeline traces of the collected files
+    manifest = TraceManifest(DATASET).load()
+
+    # load the files from the folder, the hidden files are not data
+    files_list = [file for file in os.listdir(DATASET) if not file.startswith('.')]
     logging.info(' We will create vector representations for these files: ')
 
     # for each file create and update the embeddings
     for file in files_list:
         logging.warning('    ' + file)
+        trace = manifest.get(file)
+        if trace is not None:
+            span = Span('embeddings-to-chroma', 'embed file', trace['trace_id'], trace['trace_span_id'],
+                        {'file.name': file, 'issue.id': trace['issue_id']})
         file_content = load_file(file, DATASET)
         filename = file.split(".")[0]
-        collection_count = create_doc_embeddings(document=file_content, file=filename)
+        collection_count = create_doc_embeddings(document=file_content, file=filename, index=index,
+                                                 embeddings=embeddings, chroma_db_server=chroma_db, trace=trace)
         logging.info(' Collection count is ' + str(collection_count))
+        if trace is not None:
+            span.end(**{'freshness.seconds': round(time.time() - trace['collected_at'], 3)})
+
+    # save the BM25 index, the client apps reload it when the file changes
+    index.save()
+    logging.info(' BM25 index saved, chunks count is ' + str(len(index.docs)))
 
     # chromadb heartbeat
     chroma_db.heartbeat()